@@ -0,0 +1,23 @@
+"""
+Fast JSON rendering for the voice and contextual pulse endpoints.
+"""
+
+import orjson
+from rest_framework.renderers import BaseRenderer
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Drop-in replacement for DRF's JSONRenderer backed by orjson.
+
+    Values orjson cannot encode natively (Decimal, lazy translation strings)
+    fall back to str().
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=str)
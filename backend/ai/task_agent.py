@@ -5,7 +5,6 @@ Autonomously researches and generates specific, actionable tasks
 import json
 from typing import Dict, List, Any
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from .services import AIService
 from .web_search import web_search_service
@@ -54,20 +53,14 @@ class TaskAgent:
 
         # PHASE 2: Execute searches IN PARALLEL (3x faster!)
         print(f"[TaskAgent] Executing {len(searches_needed)} searches in parallel...")
-        with ThreadPoolExecutor(max_workers=min(len(searches_needed), 5)) as executor:
-            # Submit all searches at once
-            future_to_search = {
-                executor.submit(self._execute_search, search, user_profile): search
-                for search in searches_needed
-            }
-
-            # Wait for all to complete
-            for future in as_completed(future_to_search):
-                search = future_to_search[future]
-                try:
-                    future.result()  # This will raise exception if search failed
-                except Exception as e:
-                    print(f"[TaskAgent] Search '{search.get('type')}' failed: {e}")
+        specs = [
+            self._search_spec(search, user_profile)
+            for search in searches_needed
+            if 'type' in search and 'query' in search
+        ]
+        for spec, results in zip(specs, self.search_service.search_many(specs)):
+            self.search_results.setdefault(spec['type'], []).extend(results)
+            print(f"[TaskAgent] Search '{spec['type']}' found {len(results)} results")
 
         # PHASE 3: Generate enriched tasks
         print("[TaskAgent] Generating enriched tasks...")
@@ -161,65 +154,56 @@ If NO searches are needed (tasks are already specific), return: {{"searches": []
             print(f"[TaskAgent] Planning error: {e}")
             return []
 
-    def _execute_search(
+    def _search_spec(
         self,
         search_config: Dict,
         user_profile: UserProfile
-    ):
+    ) -> Dict:
         """
-        PHASE 2: Execute a single search and store results
+        PHASE 2: Build a web search spec for one planned search
 
         Args:
             search_config: Search configuration from planning phase
             user_profile: User profile for context (location, industry, etc.)
+
+        Returns:
+            Spec dict for WebSearchService.search_many
         """
         search_type = search_config['type']
         query = search_config['query']
 
-        try:
-            if search_type == 'linkedin':
-                industry = getattr(user_profile, 'dream_career', '')
-                country = getattr(user_profile, 'country_of_residence', '')
-                results = self.search_service.search_linkedin_profiles(
-                    query=query,
-                    industry=industry,
-                    location=country,  # Use country as location filter
-                    max_results=3
-                )
-
-            elif search_type == 'events':
-                industry_query = query
-                country = getattr(user_profile, 'country_of_residence', '')
-                results = self.search_service.search_events(
-                    industry=industry_query,
-                    location=country,  # Use country as location filter
-                    timeframe="2025",
-                    max_results=3
-                )
-
-            elif search_type == 'courses':
-                results = self.search_service.search_courses(
-                    topic=query,
-                    level="intermediate",
-                    max_results=3
-                )
-
-            else:  # general
-                results = self.search_service.search_general(
-                    query=query,
-                    max_results=3
-                )
-
-            # Store results
-            if search_type not in self.search_results:
-                self.search_results[search_type] = []
-
-            self.search_results[search_type].extend(results)
-
-            print(f"[TaskAgent] Search '{search_type}' found {len(results)} results")
+        if search_type == 'linkedin':
+            return {
+                'type': 'linkedin',
+                'query': query,
+                'industry': getattr(user_profile, 'dream_career', ''),
+                'location': getattr(user_profile, 'country_of_residence', ''),  # Use country as location filter
+                'max_results': 3,
+            }
 
-        except Exception as e:
-            print(f"[TaskAgent] Search execution error ({search_type}): {e}")
+        elif search_type == 'events':
+            return {
+                'type': 'events',
+                'industry': query,
+                'location': getattr(user_profile, 'country_of_residence', ''),  # Use country as location filter
+                'timeframe': "2025",
+                'max_results': 3,
+            }
+
+        elif search_type == 'courses':
+            return {
+                'type': 'courses',
+                'topic': query,
+                'level': "intermediate",
+                'max_results': 3,
+            }
+
+        else:  # general (search_many treats unknown types as general too)
+            return {
+                'type': search_type,
+                'query': query,
+                'max_results': 3,
+            }
 
     def _generate_enriched_tasks(
         self,
@@ -1,3 +1,64 @@
-from django.test import TestCase
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from ai.voice_processor import VoiceProcessor
+from ai.voice_views import VOICE_CAPABILITIES
+
+
+class VoiceFastPathTests(SimpleTestCase):
+    """Local intent rules must never contradict the documented examples"""
+
+    def classify(self, transcript):
+        return VoiceProcessor._classify_intent_fast(transcript)
+
+    def test_capability_examples_keep_their_intent(self):
+        # The fast path may defer to the LLM (None), but must not misroute
+        for capability in VOICE_CAPABILITIES:
+            for example in capability["examples"]:
+                with self.subTest(example=example):
+                    intent = self.classify(example)
+                    if intent is not None:
+                        self.assertEqual(intent["type"], capability["intent"])
+
+    def test_complete_task_identifier_drops_filler(self):
+        self.assertEqual(
+            self.classify("Mark task done: Write SOP")["entities"]["task_identifier"],
+            "Write SOP",
+        )
+        self.assertEqual(
+            self.classify("I completed the research task")["entities"]["task_identifier"],
+            "research",
+        )
+
+    def test_ambiguous_completions_go_to_llm(self):
+        self.assertIsNone(self.classify("I completed 3 out of 5 tasks today"))
+        self.assertIsNone(self.classify("Finished writing my essay"))
+
+    def test_vague_completions_go_to_llm(self):
+        for transcript in ("done with it", "done with that", "I finished it", "Completed this one"):
+            with self.subTest(transcript=transcript):
+                self.assertIsNone(self.classify(transcript))
+
+    def test_completions_with_a_second_clause_go_to_llm(self):
+        self.assertIsNone(self.classify("I finished the essay and I feel great"))
+        self.assertIsNone(self.classify("Done with the report but it was hard"))
+
+    def test_create_task_needs_an_explicit_cue(self):
+        self.assertIsNone(self.classify("Add a note to my journal that I feel sad"))
+        self.assertIsNone(self.classify("add tasks"))
+        self.assertEqual(
+            self.classify("Add a task call the dentist")["entities"]["task_title"],
+            "call the dentist",
+        )
+        self.assertEqual(
+            self.classify("Remind me to water the plants")["entities"]["task_title"],
+            "water the plants",
+        )
+
+    def test_coach_questions_about_tasks_go_to_llm(self):
+        self.assertIsNone(self.classify("What is the best way to prioritize my tasks?"))
+        self.assertIsNone(self.classify("What should I do when I keep postponing tasks?"))
+
+    def test_list_filters(self):
+        self.assertEqual(self.classify("What tasks are overdue?")["entities"]["filter"], "overdue")
+        self.assertEqual(self.classify("Show my tasks for this week")["entities"]["filter"], "week")
+        self.assertEqual(self.classify("What's on my agenda today?")["entities"]["filter"], "today")
@@ -16,6 +16,8 @@ from .views import (
 )
 from .voice_views import (
     process_voice_command,
+    process_voice_batch,
+    stream_voice_command,
     voice_query,
     voice_capabilities,
 )
@@ -41,6 +43,8 @@ urlpatterns = [
 
     # Voice interface (Phase 4.2)
     path('voice/process/', process_voice_command, name='voice_process'),
+    path('voice/process/stream/', stream_voice_command, name='voice_process_stream'),
+    path('voice/batch/', process_voice_batch, name='voice_batch'),
     path('voice/query/', voice_query, name='voice_query'),
     path('voice/capabilities/', voice_capabilities, name='voice_capabilities'),
 ]
@@ -4,7 +4,13 @@ from rest_framework.views import APIView
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Case, When
+from django.utils import timezone
+import logging
 import os
+from datetime import date, datetime, time, timedelta
+from typing import Optional
 
 from .services import ai_service
 from users.models import UserProfile
@@ -18,6 +24,29 @@ from todos.serializers import TodoSerializer
 from events.serializers import CheckInEventSerializer, OpportunityEventSerializer
 import re
 
+logger = logging.getLogger(__name__)
+
+_MONTH_RE = re.compile(r'^\d{4}-\d{2}$')
+
+
+def parse_hh_mm(time_str) -> Optional[time]:
+    """
+    Parse an "HH:MM" string into a time.
+    Returns None for malformed input instead of raising.
+    """
+    if not isinstance(time_str, str):
+        return None
+
+    hour_str, sep, minute_str = time_str.partition(':')
+    if not sep or not hour_str.isdigit() or not minute_str.isdigit():
+        return None
+
+    try:
+        return time(hour=int(hour_str), minute=int(minute_str))
+    except ValueError:
+        # Out of range, e.g. "25:00"
+        return None
+
 
 def extract_task_title_from_message(message: str) -> str:
     """
@@ -107,9 +136,7 @@ class GenerateScenariosView(APIView):
             })
 
         except Exception as e:
-            import traceback
-            print(f"Error generating scenarios: {str(e)}")
-            print(traceback.format_exc())
+            logger.exception("Error generating scenarios")
             return Response(
                 {'error': f'Failed to generate scenarios: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -126,11 +153,10 @@ class SelectScenarioView(APIView):
         if not scenario_id:
             return Response({'error': 'scenario_id is required'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Reset all selections
-        Scenario.objects.filter(user=request.user).update(is_selected=False)
-
-        # Set new selection
-        Scenario.objects.filter(id=scenario_id, user=request.user).update(is_selected=True)
+        # Reset all selections and set the new one in a single UPDATE
+        Scenario.objects.filter(user=request.user).update(
+            is_selected=Case(When(id=scenario_id, then=True), default=False)
+        )
 
         return Response({'message': 'Scenario selected successfully'})
 
@@ -179,97 +205,104 @@ class GenerateVisionViewOld(APIView):
             # Generate vision using AI
             vision_data = ai_service.generate_vision(request.user.id, scenario_data)
 
-            # Deactivate old visions
-            Vision.objects.filter(user=request.user).update(is_active=False)
+            # Persist vision, milestones and tasks in a single transaction
+            with transaction.atomic():
+                # Deactivate old visions
+                Vision.objects.filter(user=request.user).update(is_active=False)
 
-            # Create vision
-            from datetime import datetime, timedelta
-            vision = Vision.objects.create(
-                user=request.user,
-                scenario=scenario,
-                title=vision_data.get('title', ''),
-                summary=vision_data.get('summary', ''),
-                horizon_start=vision_data.get('horizon_start'),
-                horizon_end=vision_data.get('horizon_end'),
-                monthly_milestones=vision_data.get('monthly_milestones', [])
-            )
+                # Create vision
+                vision = Vision.objects.create(
+                    user=request.user,
+                    scenario=scenario,
+                    title=vision_data.get('title', ''),
+                    summary=vision_data.get('summary', ''),
+                    horizon_start=vision_data.get('horizon_start'),
+                    horizon_end=vision_data.get('horizon_end'),
+                    monthly_milestones=vision_data.get('monthly_milestones', [])
+                )
 
-            # Create milestones from monthly milestones JSON
-            monthly_milestones = vision_data.get('monthly_milestones', [])
-            milestone_objects = []  # Store created milestone objects
+                # Create milestones from monthly milestones JSON
+                monthly_milestones = vision_data.get('monthly_milestones', [])
+                # (milestone, its monthly data) for every month that parsed
+                milestone_pairs = []
 
-            for idx, monthly in enumerate(monthly_milestones):
-                month_str = monthly.get('month')
-                if month_str:
+                for idx, monthly in enumerate(monthly_milestones):
+                    month_str = monthly.get('month')
+                    # Skip anything that isn't "YYYY-MM" without raising
+                    if not isinstance(month_str, str) or not _MONTH_RE.match(month_str):
+                        continue
                     try:
-                        due_date = datetime.strptime(f"{month_str}-15", "%Y-%m-%d").date()
-                        # Use title if present, otherwise use goal, otherwise generic name
-                        milestone_title = monthly.get('title') or monthly.get('goal', f'Month {idx + 1}')
-                        milestone_obj = Milestone.objects.create(
-                            vision=vision,
-                            title=milestone_title,
-                            description=monthly.get('goal', ''),
-                            due_date=due_date
-                        )
-                        milestone_objects.append(milestone_obj)
-                    except:
-                        pass
-
-            # Generate tasks for ALL milestones across the entire vision
-            if monthly_milestones and milestone_objects:
-                total_tasks_created = 0
-                today = datetime.now().date()
-
-                for milestone_idx, milestone_obj in enumerate(milestone_objects):
-                    milestone_data = monthly_milestones[milestone_idx]
-                    # AI returns 'tasks' field, not 'key_tasks'
-                    tasks = milestone_data.get('tasks', milestone_data.get('key_tasks', []))
-
-                    # Calculate date range for this milestone
-                    milestone_end = milestone_obj.due_date
-
-                    # For first milestone: start from today
-                    # For later milestones: start from previous milestone's due date
-                    if milestone_idx == 0:
-                        milestone_start = today
-                    else:
-                        prev_milestone = milestone_objects[milestone_idx - 1]
-                        milestone_start = prev_milestone.due_date + timedelta(days=1)
-
-                    # Calculate available days for this milestone
-                    days_available = (milestone_end - milestone_start).days
-                    if days_available <= 0:
-                        continue  # Skip if milestone is in the past
-
-                    task_count = len(tasks)
-
-                    if task_count > 0:
-                        for task_idx, task in enumerate(tasks):
-                            # Distribute tasks evenly across the milestone period
-                            day_offset = (task_idx * days_available) // task_count
-                            task_date = milestone_start + timedelta(days=day_offset)
-
-                            # Determine priority based on position
-                            if task_idx < task_count // 3:
-                                priority = 3  # First third: High
-                            elif task_idx < (2 * task_count) // 3:
-                                priority = 2  # Middle third: Medium
-                            else:
-                                priority = 1  # Last third: Low
-
-                            Todo.objects.create(
-                                user=request.user,
-                                vision=vision,
-                                milestone=milestone_obj,  # Link to this specific milestone
-                                title=task,
-                                scheduled_date=task_date,
-                                priority=priority,
-                                estimated_duration_minutes=60,  # Default 1 hour
-                                source='ai_generated'
-                            )
-                            total_tasks_created += 1
-
-                print(f"Created {total_tasks_created} tasks across {len(milestone_objects)} milestones for user {request.user.id}")
+                        due_date = date(int(month_str[:4]), int(month_str[5:7]), 15)
+                    except ValueError:
+                        # Month out of range, e.g. "2025-13"
+                        continue
+
+                    # Use title if present, otherwise use goal, otherwise generic name
+                    milestone_title = monthly.get('title') or monthly.get('goal', f'Month {idx + 1}')
+                    milestone_obj = Milestone.objects.create(
+                        vision=vision,
+                        title=milestone_title,
+                        description=monthly.get('goal', ''),
+                        due_date=due_date
+                    )
+                    milestone_pairs.append((milestone_obj, monthly))
+
+                # Generate tasks for ALL milestones across the entire vision
+                if milestone_pairs:
+                    total_tasks_created = 0
+                    today = datetime.now().date()
+
+                    prev_due = today
+
+                    for milestone_idx, (milestone_obj, milestone_data) in enumerate(milestone_pairs):
+                        # AI returns 'tasks' field, not 'key_tasks'
+                        tasks = milestone_data.get('tasks', milestone_data.get('key_tasks', []))
+
+                        # Calculate date range for this milestone
+                        milestone_end = milestone_obj.due_date
+
+                        # For first milestone: start from today
+                        # For later milestones: start from previous milestone's due date
+                        milestone_start = prev_due if milestone_idx == 0 else prev_due + timedelta(days=1)
+                        prev_due = milestone_end
+
+                        # Calculate available days for this milestone
+                        days_available = (milestone_end - milestone_start).days
+                        if days_available <= 0:
+                            continue  # Skip if milestone is in the past
+
+                        task_count = len(tasks)
+
+                        if task_count > 0:
+                            for task_idx, task in enumerate(tasks):
+                                # Distribute tasks evenly across the milestone period
+                                day_offset = (task_idx * days_available) // task_count
+                                task_date = milestone_start + timedelta(days=day_offset)
+
+                                # Determine priority based on position
+                                if task_idx < task_count // 3:
+                                    priority = 3  # First third: High
+                                elif task_idx < (2 * task_count) // 3:
+                                    priority = 2  # Middle third: Medium
+                                else:
+                                    priority = 1  # Last third: Low
+
+                                Todo.objects.create(
+                                    user=request.user,
+                                    vision=vision,
+                                    milestone=milestone_obj,  # Link to this specific milestone
+                                    title=task,
+                                    scheduled_date=task_date,
+                                    priority=priority,
+                                    estimated_duration_minutes=60,  # Default 1 hour
+                                    source='ai_generated'
+                                )
+                                total_tasks_created += 1
+
+                    logger.info(
+                        "Created %s tasks across %s milestones for user %s",
+                        total_tasks_created, len(milestone_pairs), request.user.id
+                    )
 
             # Note: TaskGenerator is disabled during vision creation
             # since we already created tasks for all milestones above.
@@ -277,7 +310,7 @@ class GenerateVisionViewOld(APIView):
 
             return Response({
                 'vision': VisionSerializer(vision).data,
-                'tasks_generated': total_tasks_created if monthly_milestones and milestone_objects else 0
+                'tasks_generated': total_tasks_created if milestone_pairs else 0
             })
 
         except Exception as e:
@@ -343,10 +376,10 @@ class EveningCheckinView(APIView):
                     if todo.status != 'done':
                         todo.status = 'done'
                         todo.completed_at = request.data.get('date')
-                        todo.save()
+                        todo.save(update_fields=['status', 'completed_at', 'updated_at'])
                         tasks_marked_done += 1
                 except Todo.DoesNotExist:
-                    print(f"Task {task_id} not found for user {request.user.id}")
+                    logger.warning("Task %s not found for user %s", task_id, request.user.id)
                     continue
 
             # Create check-in event
@@ -370,9 +403,7 @@ class EveningCheckinView(APIView):
             })
 
         except Exception as e:
-            import traceback
-            print(f"Check-in error: {str(e)}")
-            print(traceback.format_exc())
+            logger.exception("Check-in error")
             return Response(
                 {'error': f'Failed to process check-in: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -437,9 +468,8 @@ class ChatView(APIView):
         try:
             from chat.models import ChatConversation
 
-            # DEBUG logging
-            print(f"[DEBUG CHAT] Received conversation_id: {conversation_id} (type: {type(conversation_id)})")
-            print(f"[DEBUG CHAT] Request data: {request.data}")
+            logger.debug("[CHAT] Received conversation_id: %r", conversation_id)
+            logger.debug("[CHAT] Request data: %s", request.data)
 
             # Get or create conversation
             if conversation_id:
@@ -451,24 +481,13 @@ class ChatView(APIView):
                     title='New Chat'
                 )
 
-            # Save user message
-            user_msg = ChatMessage.objects.create(
-                conversation=conversation,
-                user=request.user,
-                role='user',
-                content=message
-            )
-
-            # Fetch conversation history (last 20 messages for context)
-            previous_messages = conversation.messages.order_by('created_at')[:20]
-            conversation_history = []
-            for msg in previous_messages:
-                # Don't include the message we just created
-                if msg.id != user_msg.id:
-                    conversation_history.append({
-                        "role": msg.role,
-                        "content": msg.content
-                    })
+            # Fetch conversation history (last 20 messages for context).
+            # The current message isn't stored yet, so nothing needs excluding.
+            previous_messages = conversation.messages.order_by('created_at').values('role', 'content')[:20]
+            conversation_history = [
+                {"role": msg['role'], "content": msg['content']}
+                for msg in previous_messages
+            ]
 
             # Get AI response with conversation history
             ai_response_data = ai_service.chat_response(
@@ -477,42 +496,40 @@ class ChatView(APIView):
                 conversation_history=conversation_history
             )
 
-            # DEBUG: Log AI response to see what's actually being returned
-            print(f"[DEBUG] AI Response Data: {ai_response_data}")
+            logger.debug("[CHAT] AI response data: %s", ai_response_data)
 
             ai_text = ai_response_data.get('response', '')
             tasks_to_create = ai_response_data.get('create_tasks', [])
             tasks_to_update = ai_response_data.get('update_tasks', [])
             completed_task_ids = ai_response_data.get('completed_task_ids', [])
 
-            # DEBUG: Log task arrays
-            print(f"[DEBUG] Tasks to create: {tasks_to_create}")
-            print(f"[DEBUG] Tasks to update: {tasks_to_update}")
-            print(f"[DEBUG] Tasks to complete: {completed_task_ids}")
+            logger.debug(
+                "[CHAT] Tasks to create: %s, update: %s, complete: %s",
+                tasks_to_create, tasks_to_update, completed_task_ids
+            )
 
             # Update tasks (reschedule)
             tasks_updated = 0
-            from datetime import datetime
+            now = timezone.now()
             for update_data in tasks_to_update:
                 try:
                     task_id = update_data.get('task_id')
                     todo = Todo.objects.get(id=task_id, user=request.user)
 
+                    changed_fields = ['updated_at']
                     if 'scheduled_date' in update_data:
                         todo.scheduled_date = update_data['scheduled_date']
+                        changed_fields.append('scheduled_date')
                     if 'scheduled_time' in update_data:
-                        try:
-                            from datetime import time
-                            time_str = update_data['scheduled_time']
-                            hour, minute = map(int, time_str.split(':'))
-                            todo.scheduled_time = time(hour=hour, minute=minute)
-                        except:
-                            pass
-
-                    todo.save()
+                        scheduled_time = parse_hh_mm(update_data['scheduled_time'])
+                        if scheduled_time is not None:
+                            todo.scheduled_time = scheduled_time
+                            changed_fields.append('scheduled_time')
+
+                    todo.save(update_fields=changed_fields)
                     tasks_updated += 1
                 except Todo.DoesNotExist:
-                    print(f"Task {task_id} not found for user {request.user.id}")
+                    logger.warning("Task %s not found for user %s", task_id, request.user.id)
                     continue
 
             # Mark completed tasks as done
@@ -522,67 +539,64 @@ class ChatView(APIView):
                     todo = Todo.objects.get(id=task_id, user=request.user)
                     if todo.status != 'done':
                         todo.status = 'done'
-                        todo.completed_at = datetime.now()
-                        todo.save()
+                        todo.completed_at = now
+                        todo.save(update_fields=['status', 'completed_at', 'updated_at'])
                         tasks_marked_done += 1
                 except Todo.DoesNotExist:
-                    print(f"Task {task_id} not found for user {request.user.id}")
+                    logger.warning("Task %s not found for user %s", task_id, request.user.id)
                     continue
 
-            # Save AI message
-            ai_msg = ChatMessage.objects.create(
-                conversation=conversation,
-                user=request.user,
-                role='assistant',
-                content=ai_text
-            )
+            # Save user + AI messages in a single INSERT
+            user_msg, ai_msg = ChatMessage.objects.bulk_create([
+                ChatMessage(
+                    conversation=conversation,
+                    user=request.user,
+                    role='user',
+                    content=message
+                ),
+                ChatMessage(
+                    conversation=conversation,
+                    user=request.user,
+                    role='assistant',
+                    content=ai_text
+                ),
+            ])
 
             # Auto-generate title from first message
             if not conversation.auto_titled and conversation.messages.count() >= 2:
                 # Use first user message as title (truncated)
                 conversation.title = message[:50]
                 conversation.auto_titled = True
-                conversation.save()
+                conversation.save(update_fields=['title', 'auto_titled', 'updated_at'])
 
             # Create tasks if AI suggested any
             created_tasks = []
             if tasks_to_create:
-                from datetime import datetime, timedelta
-                from django.utils import timezone
                 import pytz
 
                 # Get user's timezone for accurate "today" calculation
                 user_tz_str = request.user.timezone if request.user.timezone else 'UTC'
                 try:
                     user_tz = pytz.timezone(user_tz_str)
-                    current_time_local = timezone.now().astimezone(user_tz)
+                    current_time_local = now.astimezone(user_tz)
                 except:
-                    current_time_local = timezone.now()
+                    current_time_local = now
 
                 today = current_time_local.date()
 
+                created_todos = []
                 for task_data in tasks_to_create:
-                    # DEBUG: Log individual task data
-                    print(f"[DEBUG] Creating task from data: {task_data}")
-                    print(f"[DEBUG] Task title: '{task_data.get('title', 'MISSING!')}'")
+                    logger.debug("[CHAT] Creating task from data: %s", task_data)
 
                     # Get title with smart fallback
                     title = task_data.get('title', '').strip()
                     if not title:
                         # AI didn't provide a title, try to extract from user message
                         title = extract_task_title_from_message(message)
-                        print(f"[WARNING] AI didn't provide task title. Extracted from message: '{title}'")
+                        logger.warning("[CHAT] AI didn't provide task title. Extracted from message: %r", title)
 
                     # Parse scheduled time if provided
-                    scheduled_time = None
-                    if 'scheduled_time' in task_data:
-                        try:
-                            from datetime import time
-                            time_str = task_data['scheduled_time']
-                            hour, minute = map(int, time_str.split(':'))
-                            scheduled_time = time(hour=hour, minute=minute)
-                        except:
-                            pass
+                    scheduled_time = parse_hh_mm(task_data.get('scheduled_time'))
 
                     todo = Todo.objects.create(
                         user=request.user,
@@ -593,7 +607,10 @@ class ChatView(APIView):
                         scheduled_time=scheduled_time,
                         source='integrated'
                     )
-                    created_tasks.append(TodoSerializer(todo).data)
+                    created_todos.append(todo)
+
+                # Serialize in a single ListSerializer pass instead of per object
+                created_tasks = TodoSerializer(created_todos, many=True).data
 
             return Response({
                 'response': ai_text,
@@ -607,9 +624,7 @@ class ChatView(APIView):
             })
 
         except Exception as e:
-            import traceback
-            print(f"Chat error: {str(e)}")
-            print(traceback.format_exc())
+            logger.exception("Chat error")
             return Response(
                 {'error': f'Chat failed: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -661,14 +676,11 @@ class TaskAIAssistantView(APIView):
         conversation_id = request.data.get('conversation_id')  # Optional: for continuing existing conversation
         mode = request.data.get('mode', 'clarify')  # clarify, expand, or research
 
-        print(f"\n{'*'*80}")
-        print(f"[TASK AI VIEW] Request received")
-        print(f"[TASK AI VIEW] User: {request.user.username}")
-        print(f"[TASK AI VIEW] Task ID: {task_id}")
-        print(f"[TASK AI VIEW] Question: {question}")
-        print(f"[TASK AI VIEW] Mode: {mode}")
-        print(f"[TASK AI VIEW] Conversation ID: {conversation_id}")
-        print(f"{'*'*80}\n")
+        logger.info(
+            "[TASK AI VIEW] Request received: user=%s task_id=%s mode=%s conversation_id=%s",
+            request.user.username, task_id, mode, conversation_id
+        )
+        logger.debug("[TASK AI VIEW] Question: %s", question)
 
         if not task_id:
             return Response({'error': 'task_id is required'}, status=status.HTTP_400_BAD_REQUEST)
@@ -681,19 +693,20 @@ class TaskAIAssistantView(APIView):
 
             # Get task details
             task = Todo.objects.get(id=task_id, user=request.user)
-            print(f"[TASK AI VIEW] Task found: {task.title}")
+            logger.debug("[TASK AI VIEW] Task found: %s", task.title)
 
             # Get or create task-specific conversation
             if conversation_id:
                 try:
-                    conversation = ChatConversation.objects.get(
+                    # Only the id is read below; the task is already loaded above
+                    conversation = ChatConversation.objects.only('id').get(
                         id=conversation_id,
-                        user=request.user,
-                        task=task
+                        user_id=request.user.id,
+                        task_id=task.id
                     )
-                    print(f"[TASK AI VIEW] Using existing conversation {conversation_id}")
+                    logger.debug("[TASK AI VIEW] Using existing conversation %s", conversation_id)
                 except ChatConversation.DoesNotExist:
-                    print(f"[TASK AI VIEW] Conversation {conversation_id} not found, creating new one")
+                    logger.info("[TASK AI VIEW] Conversation %s not found, creating new one", conversation_id)
                     conversation = ChatConversation.objects.create(
                         user=request.user,
                         task=task,
@@ -706,28 +719,17 @@ class TaskAIAssistantView(APIView):
                     task=task,
                     title=f"AI Assistant: {task.title[:50]}"
                 )
-                print(f"[TASK AI VIEW] Created new conversation {conversation.id}")
+                logger.debug("[TASK AI VIEW] Created new conversation %s", conversation.id)
 
-            # Save user message
-            user_msg = ChatMessage.objects.create(
-                conversation=conversation,
-                user=request.user,
-                role='user',
-                content=question
-            )
+            # Fetch conversation history from database (last 20 messages).
+            # The current question isn't stored yet, so nothing needs excluding.
+            previous_messages = conversation.messages.order_by('created_at').values('role', 'content')[:20]
+            conversation_history = [
+                {"role": msg['role'], "content": msg['content']}
+                for msg in previous_messages
+            ]
 
-            # Fetch conversation history from database (last 20 messages)
-            previous_messages = conversation.messages.order_by('created_at')[:20]
-            conversation_history = []
-            for msg in previous_messages:
-                # Don't include the message we just created
-                if msg.id != user_msg.id:
-                    conversation_history.append({
-                        "role": msg.role,
-                        "content": msg.content
-                    })
-
-            print(f"[TASK AI VIEW] Loaded {len(conversation_history)} messages from history")
+            logger.debug("[TASK AI VIEW] Loaded %s messages from history", len(conversation_history))
 
             # Get AI response with task-specific assistance
             ai_response = ai_service.task_specific_assistance(
@@ -738,21 +740,29 @@ class TaskAIAssistantView(APIView):
                 mode=mode
             )
 
-            # Save AI message
-            ai_msg = ChatMessage.objects.create(
-                conversation=conversation,
-                user=request.user,
-                role='assistant',
-                content=ai_response.get('response'),
-                context_used={
-                    'links': ai_response.get('links', []),
-                    'contacts': ai_response.get('contacts', []),
-                    'steps': ai_response.get('steps', []),
-                    'mode': mode
-                }
-            )
-
-            print(f"[TASK AI VIEW] AI response saved, sending to client")
+            # Save user + AI messages in a single INSERT
+            user_msg, ai_msg = ChatMessage.objects.bulk_create([
+                ChatMessage(
+                    conversation=conversation,
+                    user=request.user,
+                    role='user',
+                    content=question
+                ),
+                ChatMessage(
+                    conversation=conversation,
+                    user=request.user,
+                    role='assistant',
+                    content=ai_response.get('response'),
+                    context_used={
+                        'links': ai_response.get('links', []),
+                        'contacts': ai_response.get('contacts', []),
+                        'steps': ai_response.get('steps', []),
+                        'mode': mode
+                    }
+                ),
+            ])
+
+            logger.debug("[TASK AI VIEW] AI response saved, sending to client")
             return Response({
                 'response': ai_response.get('response'),
                 'links': ai_response.get('links', []),
@@ -769,9 +779,7 @@ class TaskAIAssistantView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         except Exception as e:
-            import traceback
-            print(f"Task AI assistant error: {str(e)}")
-            print(traceback.format_exc())
+            logger.exception("Task AI assistant error")
             return Response(
                 {'error': f'AI assistant failed: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -803,22 +811,24 @@ class TaskConversationHistoryView(APIView):
                     'message': 'No conversation found for this task'
                 })
 
-            # Get all messages in conversation
-            messages = conversation.messages.all()
+            # Get all messages in conversation (single query, reused below)
+            messages = list(conversation.messages.select_related('user', 'conversation').only(
+                'id', 'role', 'content', 'is_voice', 'created_at', 'context_used',
+                'user', 'conversation'
+            ))
             serializer = ChatMessageListSerializer(messages, many=True)
 
             # Extract links, contacts, steps from context_used for frontend compatibility
             formatted_messages = []
-            for msg_data in serializer.data:
+            for msg_obj, msg_data in zip(messages, serializer.data):
                 msg = {
                     'role': msg_data['role'],
                     'content': msg_data['content'],
                     'created_at': msg_data['created_at']
                 }
 
-                # Get context from the ChatMessage to extract links, contacts, steps
-                msg_obj = messages.get(id=msg_data['id'])
-                context = msg_obj.context_used if hasattr(msg_obj, 'context_used') else {}
+                # Read context from the already-loaded ChatMessage
+                context = msg_obj.context_used or {}
 
                 if msg_data['role'] == 'assistant' and context:
                     msg['links'] = context.get('links', [])
@@ -840,9 +850,7 @@ class TaskConversationHistoryView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         except Exception as e:
-            import traceback
-            print(f"Error fetching task conversation: {str(e)}")
-            print(traceback.format_exc())
+            logger.exception("Error fetching task conversation")
             return Response(
                 {'error': f'Failed to fetch conversation: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -864,19 +872,16 @@ class CreateSubtasksFromAIView(APIView):
             return Response({'error': 'steps are required'}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            from datetime import datetime, timedelta
-
             parent_task = Todo.objects.get(id=parent_task_id, user=request.user)
 
-            created_subtasks = []
-            today = datetime.now().date()
-
             # Use parent task's scheduled date or today as base
-            base_date = parent_task.scheduled_date if parent_task.scheduled_date else today
+            base_date = parent_task.scheduled_date or timezone.now().date()
 
-            for idx, step in enumerate(steps):
-                # Create subtask with scheduled_date (required field)
-                subtask = Todo.objects.create(
+            # Build all subtasks up front and insert them in one multi-row INSERT.
+            # Subtasks carry no scheduled_time, so skipping post_save
+            # (reminder calculation) is safe here.
+            subtask_objects = [
+                Todo(
                     user=request.user,
                     title=step if isinstance(step, str) else step.get('text', f'Step {idx + 1}'),
                     description=f'Subtask generated from AI suggestion for: {parent_task.title}',
@@ -886,15 +891,28 @@ class CreateSubtasksFromAIView(APIView):
                     priority=parent_task.priority,
                     status='ready',  # Changed from 'pending' to 'ready'
                     scheduled_date=base_date,  # REQUIRED FIELD
-                    goalspec=parent_task.goalspec,
+                    goalspec_id=parent_task.goalspec_id,  # FK id only, no goalspec fetch
                     parent_task_id=parent_task_id,
                 )
-                created_subtasks.append(subtask)
-
-            from todos.serializers import TodoSerializer
+                for idx, step in enumerate(steps)
+            ]
+            created_subtasks = Todo.objects.bulk_create(subtask_objects, batch_size=500)
+
+            # Lightweight projection of the rows we just inserted; the client
+            # only needs the basics, so skip full TodoSerializer introspection
+            subtasks_data = [
+                {
+                    'id': subtask.id,
+                    'title': subtask.title,
+                    'priority': subtask.priority,
+                    'scheduled_date': subtask.scheduled_date,
+                    'status': subtask.status,
+                }
+                for subtask in created_subtasks
+            ]
             return Response({
                 'message': f'Created {len(created_subtasks)} subtasks',
-                'subtasks': TodoSerializer(created_subtasks, many=True).data
+                'subtasks': subtasks_data
             })
 
         except Todo.DoesNotExist:
@@ -903,9 +921,7 @@ class CreateSubtasksFromAIView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         except Exception as e:
-            import traceback
-            print(f"Create subtasks error: {str(e)}")
-            print(traceback.format_exc())
+            logger.exception("Create subtasks error")
             return Response(
                 {'error': f'Failed to create subtasks: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -929,7 +945,7 @@ class GenerateTaskDescriptionView(APIView):
             if not task.description:
                 description = ai_service.generate_task_description(request.user.id, task)
                 task.description = description
-                task.save()
+                task.save(update_fields=['description', 'updated_at'])
 
             return Response({
                 'description': task.description,
@@ -942,9 +958,7 @@ class GenerateTaskDescriptionView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         except Exception as e:
-            import traceback
-            print(f"Generate task description error: {str(e)}")
-            print(traceback.format_exc())
+            logger.exception("Generate task description error")
             return Response(
                 {'error': f'Failed to generate description: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -976,16 +990,17 @@ class GenerateAtomicTasksView(APIView):
             # Get goalspec
             goalspec = GoalSpec.objects.get(id=goalspec_id, user=request.user)
 
-            # IDEMPOTENCY CHECK: Check if tasks already exist for this goalspec
-            existing_tasks = Todo.objects.filter(
+            # IDEMPOTENCY CHECK: Check if tasks already exist for this goalspec.
+            # Materialize once so the check, count and serialization share one query.
+            existing_tasks = list(Todo.objects.filter(
                 user=request.user,
                 goalspec=goalspec,
                 source='template_agent'
-            )
+            ))
 
-            if existing_tasks.exists():
-                existing_count = existing_tasks.count()
-                print(f"[GenerateAtomicTasksView] Found {existing_count} existing tasks for goal: {goalspec.title}")
+            if existing_tasks:
+                existing_count = len(existing_tasks)
+                logger.info("[GenerateAtomicTasksView] Found %s existing tasks for goal: %s", existing_count, goalspec.title)
 
                 # Return existing tasks instead of generating duplicates
                 return Response({
@@ -1000,8 +1015,10 @@ class GenerateAtomicTasksView(APIView):
             # Initialize agent
             agent = AtomicTaskAgent(request.user)
 
-            print(f"[GenerateAtomicTasksView] Generating tasks for goal: {goalspec.title}")
-            print(f"[GenerateAtomicTasksView] use_templates={use_templates}, enhance={enhance}")
+            logger.info(
+                "[GenerateAtomicTasksView] Generating tasks for goal: %s (use_templates=%s, enhance=%s)",
+                goalspec.title, use_templates, enhance
+            )
 
             # Generate tasks
             tasks = agent.generate_atomic_tasks(
@@ -1012,23 +1029,21 @@ class GenerateAtomicTasksView(APIView):
             )
 
             if not tasks or len(tasks) == 0:
-                print(f"[GenerateAtomicTasksView] No tasks generated - template matching failed")
+                logger.warning("[GenerateAtomicTasksView] No tasks generated - template matching failed")
                 return Response({
                     'error': 'No tasks could be generated for this goal. Please check the goal specifications.',
                     'count': 0
                 }, status=status.HTTP_400_BAD_REQUEST)
 
-            # Save tasks to database
-            created_tasks = []
+            # Build unsaved Todo instances, then persist them in one INSERT
+            todos = []
             for task_data in tasks:
                 # Parse scheduled_date (convert from string to date if needed)
                 scheduled_date = task_data.get('scheduled_date')
                 if isinstance(scheduled_date, str):
-                    from datetime import datetime
                     scheduled_date = datetime.strptime(scheduled_date, '%Y-%m-%d').date()
 
-                # Create Todo from task_data
-                todo = Todo.objects.create(
+                todos.append(Todo(
                     user=request.user,
                     goalspec=goalspec,
                     title=task_data['title'],
@@ -1043,10 +1058,14 @@ class GenerateAtomicTasksView(APIView):
                     definition_of_done=task_data.get('definition_of_done', []),
                     constraints=task_data.get('constraints', {}),
                     notes=task_data.get('notes', '')
-                )
-                created_tasks.append(todo)
+                ))
+
+            # Template tasks have no scheduled_time, so the post_save reminder
+            # signal that bulk_create skips would be a no-op anyway
+            with transaction.atomic():
+                created_tasks = Todo.objects.bulk_create(todos, batch_size=200)
 
-            print(f"[GenerateAtomicTasksView] Created {len(created_tasks)} tasks")
+            logger.info("[GenerateAtomicTasksView] Created %s tasks", len(created_tasks))
 
             return Response({
                 'tasks': TodoSerializer(created_tasks, many=True).data,
@@ -1062,9 +1081,7 @@ class GenerateAtomicTasksView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         except Exception as e:
-            import traceback
-            print(f"Generate atomic tasks error: {str(e)}")
-            print(traceback.format_exc())
+            logger.exception("Generate atomic tasks error")
             return Response(
                 {'error': f'Failed to generate tasks: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
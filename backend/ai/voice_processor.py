@@ -12,12 +12,138 @@ Supported intents:
 - daily_checkin
 """
 
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from anthropic import Anthropic
-from typing import Dict, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta
+from django.db.models import Count, Q
 from django.utils import timezone
-import json
+import re
+
+logger = logging.getLogger(__name__)
+
+
+# Fast-path patterns for high-frequency commands. They only accept anchored,
+# unambiguous phrasings; anything else (questions to the coach, check-ins with
+# counts, loosely worded completions) falls through to the LLM classifier.
+_LIST_TASKS_RE = re.compile(
+    r"^(?:"
+    r"(?:show|list|give)\s+(?:me\s+)?(?:all\s+)?(?:of\s+)?(?:my\s+)?(?:overdue\s+)?tasks?"
+    r"(?:\s+(?:for\s+)?(?:today|this\s+week))?"
+    r"|what(?:'s|\s+is)\s+on\s+my\s+(?:agenda|list|plate|schedule)(?:\s+(?:for\s+)?(?:today|this\s+week))?"
+    r"|what\s+tasks\s+are\s+(?:overdue|due(?:\s+today|\s+this\s+week)?)"
+    r")$",
+    re.IGNORECASE,
+)
+_COMPLETE_TASK_RE = re.compile(
+    r"^(?:"
+    r"mark\s+(?:task\s+)?(?:as\s+)?(?:done|complete|completed|finished)\s*:\s*(?P<colon_title>.+)"
+    r"|mark\s+(?P<mark_title>.+?)\s+as\s+(?:done|complete|completed|finished)"
+    r"|(?:i\s+(?:just\s+|have\s+)?)?(?:completed|finished|done\s+with)\s+(?P<title>.+)"
+    r")$",
+    re.IGNORECASE,
+)
+# Leading articles/possessives and a trailing "task" are filler, not part of
+# the title that _handle_complete_task matches with icontains
+_TASK_TITLE_FILLER_RE = re.compile(
+    r"^(?:(?:the|my|a|an|this|that|these|those)(?:\s+|$))+|\s+task$",
+    re.IGNORECASE,
+)
+# Titles this short, or that are just a pronoun, would match an arbitrary
+# task with icontains
+_MIN_TASK_TITLE_LENGTH = 3
+_VAGUE_TASK_TITLE_RE = re.compile(r"^(?:it|them|one|that\s+one|this\s+one|everything)$", re.IGNORECASE)
+# Counts ("3 out of 5 tasks"), several tasks, a gerund ("writing my essay")
+# or a second clause ("the essay and I feel great") don't name one task
+# title, so the LLM resolves those
+_COMPLETE_NEEDS_LLM_RE = re.compile(
+    r"\d|\b(?:tasks|all|everything|today|out\s+of|and|but|because)\b|^\w+ing\b",
+    re.IGNORECASE,
+)
+# Only explicit task cues; a bare "add ..." may be a note or a journal entry
+_CREATE_TASK_RE = re.compile(
+    r"^(?:(?:add|create)\s+(?:a\s+)?(?:new\s+)?task|new\s+task|remind\s+me\s+to)"
+    r"\s*:?\s+(?:to\s+)?(?P<title>.+)$",
+    re.IGNORECASE,
+)
+# Dates/priorities need LLM extraction, so these send create_task to the slow path
+_CREATE_NEEDS_LLM_RE = re.compile(
+    r"\b(?:today|tonight|tomorrow|next|by|on|before|until|urgent|important|priority|"
+    r"monday|tuesday|wednesday|thursday|friday|saturday|sunday|\d+)\b",
+    re.IGNORECASE,
+)
+_LIST_FILTER_RE = re.compile(r"\b(overdue|week|all)\b", re.IGNORECASE)
+
+# Static intent-classification instructions; the transcript is sent as a
+# separate block. Not marked for prompt caching: at a few hundred tokens it is
+# well below the model's minimum cacheable prefix, so the marker would be ignored.
+_CLASSIFY_PROMPT = """You are PathAI's voice assistant. Classify the user voice command that follows.
+
+Classify into ONE of these intents:
+1. **create_task**: User wants to add a new task
+   - Extract: task_title, deadline (if mentioned), priority
+2. **complete_task**: User finished a task
+   - Extract: task_identifier (title or partial match)
+3. **list_tasks**: User wants to see tasks
+   - Extract: filter (today, week, all, overdue)
+4. **coach_query**: User asking coach for advice/help
+   - Extract: question_topic
+5. **performance_query**: User asking about their progress
+   - Extract: time_period (today, week, month)
+6. **daily_checkin**: User doing daily check-in
+   - Extract: completed_count, feelings
+
+Also extract:
+- **sentiment**: positive, neutral, negative, stressed
+
+Report the result with the classify_intent tool. Dates use YYYY-MM-DD.
+If command is unclear, use type "unknown".
+"""
+
+# Structured output for the classifier: the model fills this tool's input
+# instead of writing free-form JSON that needs fence stripping.
+_CLASSIFY_TOOL = {
+    "name": "classify_intent",
+    "description": "Record the classified intent of a voice command.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "type": {
+                "type": "string",
+                "enum": [
+                    "create_task", "complete_task", "list_tasks", "coach_query",
+                    "performance_query", "daily_checkin", "unknown",
+                ],
+            },
+            "entities": {
+                "type": "object",
+                "properties": {
+                    "task_title": {"type": "string"},
+                    "deadline": {"type": "string"},
+                    "priority": {"type": "string", "enum": ["high", "medium", "low"]},
+                    "task_identifier": {"type": "string"},
+                    "filter": {"type": "string", "enum": ["today", "week", "all", "overdue"]},
+                    "question_topic": {"type": "string"},
+                    "time_period": {"type": "string", "enum": ["today", "week", "month"]},
+                    "completed_count": {"type": "integer"},
+                    "feelings": {"type": "string"},
+                },
+            },
+            "sentiment": {
+                "type": "string",
+                "enum": ["positive", "neutral", "negative", "stressed"],
+            },
+        },
+        "required": ["type"],
+    },
+}
+
+
+# Intent classification for batched commands runs here; it is pure network
+# I/O (one Haiku call per miss), so threads overlap the LLM round-trips
+_CLASSIFY_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='voice-classify')
 
 
 class VoiceProcessor:
@@ -27,7 +153,8 @@ class VoiceProcessor:
 
     def __init__(self):
         self.anthropic = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
-        self.model = "claude-3-5-sonnet-20241022"
+        # Intent classification emits a tiny JSON object; Haiku is plenty
+        self.model = "claude-3-5-haiku-20241022"
 
     def process_command(self, user, transcript: str) -> Dict:
         """
@@ -45,9 +172,72 @@ class VoiceProcessor:
                 "success": True
             }
         """
-        # Classify intent
-        intent = self._classify_intent(transcript)
+        intent = self._classify(transcript)
+        return self._execute_intent(user, intent)
+
+    def stream_command(self, user, transcript: str) -> Iterator[Tuple[str, Dict]]:
+        """
+        Streaming variant of process_command.
+
+        Yields (phase, payload) tuples as soon as each piece is known, so a
+        client can show the recognised intent while the action still runs:
+            ("intent", {"intent": ..., "entities": {...}})
+            ("action", {"intent": ..., "action_taken": {...}})
+            ("response", {"response_text": ..., "success": ...})
+        """
+        intent = self._classify(transcript)
+
+        if intent:
+            yield 'intent', {
+                "intent": intent['type'],
+                "entities": intent.get('entities', {}),
+            }
+
+        result = self._execute_intent(user, intent)
 
+        yield 'action', {
+            "intent": result['intent'],
+            "action_taken": result['action_taken'],
+        }
+        yield 'response', {
+            "response_text": result['response_text'],
+            "success": result['success'],
+        }
+
+    def process_commands(self, user, transcripts: List[str]) -> List[Dict]:
+        """
+        Process a batch of voice commands, e.g. ones queued while offline.
+
+        Intents are classified concurrently; the resulting actions then run
+        one at a time in the original order, so a command can depend on an
+        earlier one in the batch ("add task X", then "mark X done").
+
+        Returns:
+            One process_command-style result per transcript, in order
+        """
+        intents = list(_CLASSIFY_EXECUTOR.map(self._classify, transcripts))
+
+        results = []
+        for transcript, intent in zip(transcripts, intents):
+            try:
+                results.append(self._execute_intent(user, intent))
+            except Exception as e:
+                logger.exception("Error processing batched voice command")
+                results.append({
+                    "intent": intent['type'] if intent else "unknown",
+                    "action_taken": None,
+                    "response_text": "Sorry, I encountered an error. Could you try again?",
+                    "success": False,
+                    "error": f"Failed to process command: {str(e)}",
+                })
+        return results
+
+    def _classify(self, transcript: str) -> Optional[Dict]:
+        """Classify intent: local rules first, LLM on a miss"""
+        return self._classify_intent_fast(transcript) or self._classify_intent(transcript)
+
+    def _execute_intent(self, user, intent: Optional[Dict]) -> Dict:
+        """Run the handler for a classified intent."""
         if not intent:
             return {
                 "intent": "unknown",
@@ -83,6 +273,60 @@ class VoiceProcessor:
                 "success": False
             }
 
+    @staticmethod
+    def _classify_intent_fast(transcript: str) -> Optional[Dict]:
+        """
+        Classify common, unambiguous commands without calling Claude.
+
+        Returns an intent in the same shape as _classify_intent, or None
+        when the transcript should go to the LLM.
+        """
+        text = transcript.strip()
+        is_question = text.endswith('?')
+        text = text.rstrip('.!?').strip()
+
+        if _LIST_TASKS_RE.match(text):
+            match = _LIST_FILTER_RE.search(text)
+            return {
+                "type": "list_tasks",
+                "entities": {"filter": match.group(1).lower() if match else "today"},
+                "sentiment": "neutral",
+            }
+
+        # Only list requests are phrased as questions; any other question is
+        # for the coach or about performance
+        if is_question:
+            return None
+
+        match = _COMPLETE_TASK_RE.match(text)
+        if match:
+            title = match.group('colon_title') or match.group('mark_title') or match.group('title')
+            title = _TASK_TITLE_FILLER_RE.sub('', title.strip()).strip()
+            if (
+                len(title) < _MIN_TASK_TITLE_LENGTH
+                or _VAGUE_TASK_TITLE_RE.match(title)
+                or _COMPLETE_NEEDS_LLM_RE.search(title)
+            ):
+                return None
+            return {
+                "type": "complete_task",
+                "entities": {"task_identifier": title},
+                "sentiment": "neutral",
+            }
+
+        match = _CREATE_TASK_RE.match(text)
+        if match:
+            title = match.group('title').strip()
+            if len(title) < _MIN_TASK_TITLE_LENGTH or _CREATE_NEEDS_LLM_RE.search(title):
+                return None
+            return {
+                "type": "create_task",
+                "entities": {"task_title": title, "priority": "medium"},
+                "sentiment": "neutral",
+            }
+
+        return None
+
     def _classify_intent(self, transcript: str) -> Optional[Dict]:
         """
         Use Claude to classify voice command intent.
@@ -98,62 +342,30 @@ class VoiceProcessor:
                 "sentiment": "neutral"
             }
         """
-        prompt = f"""You are PathAI's voice assistant. Classify this user voice command.
-
-Voice command: "{transcript}"
-
-Classify into ONE of these intents:
-1. **create_task**: User wants to add a new task
-   - Extract: task_title, deadline (if mentioned), priority
-2. **complete_task**: User finished a task
-   - Extract: task_identifier (title or partial match)
-3. **list_tasks**: User wants to see tasks
-   - Extract: filter (today, week, all, overdue)
-4. **coach_query**: User asking coach for advice/help
-   - Extract: question_topic
-5. **performance_query**: User asking about their progress
-   - Extract: time_period (today, week, month)
-6. **daily_checkin**: User doing daily check-in
-   - Extract: completed_count, feelings
-
-Also extract:
-- **sentiment**: positive, neutral, negative, stressed
-
-Return JSON ONLY:
-{{
-    "type": "create_task",
-    "entities": {{
-        "task_title": "Review Cambridge application",
-        "deadline": "2025-11-08",
-        "priority": "medium"
-    }},
-    "sentiment": "neutral"
-}}
-
-If command is unclear, return {{"type": "unknown"}}.
-"""
+        content = [
+            {"type": "text", "text": _CLASSIFY_PROMPT},
+            {"type": "text", "text": f'Voice command: "{transcript}"'},
+        ]
 
         try:
             response = self.anthropic.messages.create(
                 model=self.model,
-                max_tokens=500,
+                max_tokens=150,
                 temperature=0.3,
-                messages=[{"role": "user", "content": prompt}]
+                tools=[_CLASSIFY_TOOL],
+                tool_choice={"type": "tool", "name": _CLASSIFY_TOOL["name"]},
+                messages=[{"role": "user", "content": content}]
             )
 
-            response_text = response.content[0].text
+            # Forced tool_choice guarantees a tool_use block carrying the dict
+            for block in response.content:
+                if block.type == "tool_use":
+                    return block.input
 
-            # Extract JSON
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-
-            intent = json.loads(response_text)
-            return intent
+            return None
 
-        except Exception as e:
-            print(f"Error classifying intent: {e}")
+        except Exception:
+            logger.exception("Error classifying intent")
             return None
 
     def _handle_create_task(self, user, intent: Dict) -> Dict:
@@ -163,15 +375,16 @@ If command is unclear, return {{"type": "unknown"}}.
         entities = intent.get('entities', {})
         task_title = entities.get('task_title', 'Untitled task')
 
-        # Parse deadline
+        # Parse deadline once; fall back to a week out if missing or malformed
+        today = timezone.now().date()
+        deadline_date = None
         deadline_str = entities.get('deadline')
         if deadline_str:
             try:
-                scheduled_date = datetime.strptime(deadline_str, '%Y-%m-%d').date()
-            except:
-                scheduled_date = timezone.now().date() + timedelta(days=7)
-        else:
-            scheduled_date = timezone.now().date() + timedelta(days=7)
+                deadline_date = datetime.strptime(deadline_str, '%Y-%m-%d').date()
+            except (TypeError, ValueError):
+                deadline_date = None
+        scheduled_date = deadline_date or today + timedelta(days=7)
 
         # Parse priority
         priority_map = {'high': 3, 'medium': 2, 'low': 1}
@@ -192,14 +405,13 @@ If command is unclear, return {{"type": "unknown"}}.
 
             # Generate response
             deadline_phrase = ""
-            if deadline_str:
-                date_obj = datetime.strptime(deadline_str, '%Y-%m-%d')
-                if date_obj.date() == timezone.now().date():
+            if deadline_date:
+                if deadline_date == today:
                     deadline_phrase = "for today"
-                elif date_obj.date() == timezone.now().date() + timedelta(days=1):
+                elif deadline_date == today + timedelta(days=1):
                     deadline_phrase = "for tomorrow"
                 else:
-                    deadline_phrase = f"for {date_obj.strftime('%A, %B %d')}"
+                    deadline_phrase = f"for {deadline_date.strftime('%A, %B %d')}"
 
             response_text = f"Got it! I've added '{task_title}' {deadline_phrase}."
 
@@ -215,8 +427,8 @@ If command is unclear, return {{"type": "unknown"}}.
                 "success": True
             }
 
-        except Exception as e:
-            print(f"Error creating task: {e}")
+        except Exception:
+            logger.exception("Error creating task")
             return {
                 "intent": "create_task",
                 "action_taken": None,
@@ -231,14 +443,14 @@ If command is unclear, return {{"type": "unknown"}}.
         entities = intent.get('entities', {})
         task_identifier = entities.get('task_identifier', '')
 
-        # Find matching task
-        tasks = Todo.objects.filter(
+        # Find matching task (icontains is served by the title trigram index on PostgreSQL)
+        task = Todo.objects.filter(
             user=user,
             status__in=['ready', 'in_progress'],
             title__icontains=task_identifier
-        ).order_by('-priority', 'scheduled_date')[:1]
+        ).order_by('-priority', 'scheduled_date').values('id', 'title').first()
 
-        if not tasks.exists():
+        if task is None:
             return {
                 "intent": "complete_task",
                 "action_taken": None,
@@ -246,24 +458,26 @@ If command is unclear, return {{"type": "unknown"}}.
                 "success": False
             }
 
-        task = tasks.first()
-        task.status = 'done'
-        task.completed_at = timezone.now()
-        task.save(update_fields=['status', 'completed_at'])
+        # Direct UPDATE, no model load. The post_save handlers skipped here
+        # are no-ops for 'done' tasks anyway.
+        now = timezone.now()
+        Todo.objects.filter(pk=task['id']).update(
+            status='done', completed_at=now, updated_at=now
+        )
 
         # Count today's completions
         today_completed = Todo.objects.filter(
             user=user,
-            completed_at__date=timezone.now().date()
+            completed_at__date=now.date()
         ).count()
 
-        response_text = f"Awesome! '{task.title}' is marked done. That's task {today_completed} today!"
+        response_text = f"Awesome! '{task['title']}' is marked done. That's task {today_completed} today!"
 
         return {
             "intent": "complete_task",
             "action_taken": {
-                "task_id": task.id,
-                "title": task.title,
+                "task_id": task['id'],
+                "title": task['title'],
                 "today_count": today_completed,
             },
             "response_text": response_text,
@@ -276,30 +490,34 @@ If command is unclear, return {{"type": "unknown"}}.
 
         entities = intent.get('entities', {})
         filter_type = entities.get('filter', 'today')
+        today = timezone.now().date()
 
         if filter_type == 'today':
             tasks = Todo.objects.filter(
                 user=user,
-                scheduled_date=timezone.now().date(),
+                scheduled_date=today,
                 status__in=['ready', 'in_progress']
             ).order_by('-priority')[:5]
 
         elif filter_type == 'overdue':
             tasks = Todo.objects.filter(
                 user=user,
-                scheduled_date__lt=timezone.now().date(),
+                scheduled_date__lt=today,
                 status__in=['ready', 'in_progress']
             ).order_by('scheduled_date')[:5]
 
         else:  # this week
-            week_end = timezone.now().date() + timedelta(days=7)
+            week_end = today + timedelta(days=7)
             tasks = Todo.objects.filter(
                 user=user,
                 scheduled_date__lte=week_end,
                 status__in=['ready', 'in_progress']
             ).order_by('-priority', 'scheduled_date')[:5]
 
-        if not tasks.exists():
+        # Fetch plain dicts once; no model instances needed for a read-only list
+        tasks = list(tasks.values('id', 'title', 'priority', 'scheduled_date'))
+
+        if not tasks:
             return {
                 "intent": "list_tasks",
                 "action_taken": {"tasks": []},
@@ -309,18 +527,16 @@ If command is unclear, return {{"type": "unknown"}}.
 
         # Build response
         task_list = []
+        response_lines = [f"Here are your {filter_type} tasks:"]
         for i, task in enumerate(tasks, 1):
             task_list.append({
-                "id": task.id,
-                "title": task.title,
-                "priority": task.priority,
-                "scheduled_date": str(task.scheduled_date),
+                "id": task['id'],
+                "title": task['title'],
+                "priority": task['priority'],
+                "scheduled_date": str(task['scheduled_date']),
             })
-
-        response_lines = [f"Here are your {filter_type} tasks:"]
-        for i, task in enumerate(tasks, 1):
-            priority_marker = "🔥" if task.priority == 3 else "⭐" if task.priority == 2 else "📝"
-            response_lines.append(f"{i}. {priority_marker} {task.title}")
+            priority_marker = "🔥" if task['priority'] == 3 else "⭐" if task['priority'] == 2 else "📝"
+            response_lines.append(f"{i}. {priority_marker} {task['title']}")
 
         response_text = "\n".join(response_lines)
 
@@ -377,24 +593,32 @@ If command is unclear, return {{"type": "unknown"}}.
         time_period = entities.get('time_period', 'week')
 
         # Calculate stats
+        today = timezone.now().date()
         if time_period == 'today':
-            date_filter = timezone.now().date()
-            tasks = Todo.objects.filter(user=user, scheduled_date=date_filter)
+            tasks = Todo.objects.filter(user=user, scheduled_date=today)
         elif time_period == 'week':
-            week_start = timezone.now().date() - timedelta(days=timezone.now().weekday())
+            week_start = today - timedelta(days=today.weekday())
             tasks = Todo.objects.filter(user=user, scheduled_date__gte=week_start)
         else:  # month
-            month_start = timezone.now().date().replace(day=1)
+            month_start = today.replace(day=1)
             tasks = Todo.objects.filter(user=user, scheduled_date__gte=month_start)
 
-        total = tasks.count()
-        completed = tasks.filter(status='done').count()
+        # Both counts in one SELECT
+        stats = tasks.aggregate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status='done')),
+        )
+        total, completed = stats['total'], stats['completed']
         completion_rate = (completed / total * 100) if total > 0 else 0
 
+        # current_streak is a concrete column on User and request.user is loaded
+        # in full by JWT auth, so this is an attribute read, not a query
+        streak = user.current_streak
+
         response_text = (
             f"This {time_period}, you've completed {completed} out of {total} tasks. "
             f"That's {int(completion_rate)}% completion rate. "
-            f"Your current streak is {user.current_streak} days."
+            f"Your current streak is {streak} days."
         )
 
         return {
@@ -403,7 +627,7 @@ If command is unclear, return {{"type": "unknown"}}.
                 "completed": completed,
                 "total": total,
                 "completion_rate": completion_rate,
-                "streak": user.current_streak,
+                "streak": streak,
             },
             "response_text": response_text,
             "success": True
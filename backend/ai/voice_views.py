@@ -4,16 +4,97 @@ Voice Interface API Views
 Endpoints for voice command processing.
 """
 
+import hashlib
+import json
+import logging
+import unicodedata
+from types import MappingProxyType
+
+import orjson
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from .renderers import ORJSONRenderer
 from .voice_processor import voice_processor
 
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_TRANSCRIPTS = 16
+# Spoken commands are a sentence or two; anything longer is a client bug or
+# abuse and would only burn classification tokens
+MAX_TRANSCRIPT_LENGTH = 1000
+
+
+# Static payload for voice_capabilities; it never varies per user, so it is
+# frozen (read-only mappings, tuples) and serialized once at import time
+# instead of on every request.
+VOICE_CAPABILITIES = tuple(MappingProxyType(capability) for capability in (
+    {
+        "intent": "create_task",
+        "examples": (
+            "Add task review Cambridge application by Friday",
+            "Create task call mentor tomorrow",
+            "Remind me to submit IELTS scores next week"
+        ),
+        "description": "Create a new task with optional deadline and priority"
+    },
+    {
+        "intent": "complete_task",
+        "examples": (
+            "Mark task done: Write SOP",
+            "I completed the research task",
+            "Finished writing my essay"
+        ),
+        "description": "Mark a task as completed"
+    },
+    {
+        "intent": "list_tasks",
+        "examples": (
+            "What's on my agenda today?",
+            "Show my tasks for this week",
+            "What tasks are overdue?"
+        ),
+        "description": "List tasks with optional filters (today, week, overdue)"
+    },
+    {
+        "intent": "coach_query",
+        "examples": (
+            "Coach, am I on track?",
+            "How am I doing?",
+            "What should I focus on?"
+        ),
+        "description": "Ask the adaptive coach for advice"
+    },
+    {
+        "intent": "performance_query",
+        "examples": (
+            "What's my completion rate this week?",
+            "How many tasks did I complete today?",
+            "What's my current streak?"
+        ),
+        "description": "Get performance statistics"
+    },
+    {
+        "intent": "daily_checkin",
+        "examples": (
+            "Start daily check-in",
+            "I completed 3 out of 5 tasks today",
+            "Today was overwhelming"
+        ),
+        "description": "Do daily check-in and get coaching feedback"
+    },
+))
+
+_CAPABILITIES_JSON = json.dumps({"capabilities": VOICE_CAPABILITIES}, default=dict).encode('utf-8')
+_CAPABILITIES_ETAG = '"%s"' % hashlib.md5(_CAPABILITIES_JSON).hexdigest()
+
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@renderer_classes([ORJSONRenderer])
 def process_voice_command(request):
     """
     Process voice command and return structured response.
@@ -36,7 +117,7 @@ def process_voice_command(request):
         "success": true
     }
     """
-    transcript = request.data.get('transcript', '').strip()
+    transcript = _clean_transcript(request.data.get('transcript'))
 
     if not transcript:
         return Response(
@@ -44,6 +125,12 @@ def process_voice_command(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
+    if len(transcript) > MAX_TRANSCRIPT_LENGTH:
+        return Response(
+            {'error': f'transcript must be at most {MAX_TRANSCRIPT_LENGTH} characters'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
     try:
         # Process voice command
         result = voice_processor.process_command(
@@ -54,9 +141,7 @@ def process_voice_command(request):
         return Response(result)
 
     except Exception as e:
-        print(f"Error processing voice command: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error processing voice command")
 
         return Response(
             {
@@ -69,6 +154,153 @@ def process_voice_command(request):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@renderer_classes([ORJSONRenderer])
+def process_voice_batch(request):
+    """
+    Process several voice commands in one request (e.g. queued offline).
+
+    Commands are classified concurrently but executed in the order given,
+    so later commands may refer to tasks created by earlier ones.
+
+    Request:
+    {
+        "transcripts": [
+            "Add task review Cambridge application by Friday",
+            "What's on my agenda today?"
+        ]
+    }
+
+    Response:
+    {
+        "results": [
+            {"intent": "create_task", "action_taken": {...}, "response_text": "...", "success": true},
+            {"intent": "list_tasks", "action_taken": {...}, "response_text": "...", "success": true}
+        ]
+    }
+    """
+    transcripts = request.data.get('transcripts')
+
+    if not isinstance(transcripts, list) or not transcripts:
+        return Response(
+            {'error': 'transcripts must be a non-empty list'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if len(transcripts) > MAX_BATCH_TRANSCRIPTS:
+        return Response(
+            {'error': f'At most {MAX_BATCH_TRANSCRIPTS} transcripts per batch'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    transcripts = [_clean_transcript(transcript) for transcript in transcripts]
+
+    if not all(transcripts):
+        return Response(
+            {'error': 'transcripts must be non-empty strings'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if any(len(transcript) > MAX_TRANSCRIPT_LENGTH for transcript in transcripts):
+        return Response(
+            {'error': f'Each transcript must be at most {MAX_TRANSCRIPT_LENGTH} characters'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        results = voice_processor.process_commands(
+            user=request.user,
+            transcripts=transcripts
+        )
+
+        return Response({'results': results})
+
+    except Exception as e:
+        logger.exception("Error processing voice batch")
+
+        return Response(
+            {'error': f'Failed to process commands: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def stream_voice_command(request):
+    """
+    Process voice command and stream the result as Server-Sent Events.
+
+    Same request body as process_voice_command. The client receives the
+    recognised intent as soon as classification finishes, before the
+    action itself has run:
+
+        event: intent
+        data: {"intent": "create_task", "entities": {...}}
+
+        event: action
+        data: {"intent": "create_task", "action_taken": {...}}
+
+        event: response
+        data: {"response_text": "Got it! ...", "success": true}
+
+    On failure a single "error" event carries the same payload as the
+    500 response of process_voice_command.
+    """
+    transcript = _clean_transcript(request.data.get('transcript'))
+
+    if not transcript:
+        return Response(
+            {'error': 'transcript is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if len(transcript) > MAX_TRANSCRIPT_LENGTH:
+        return Response(
+            {'error': f'transcript must be at most {MAX_TRANSCRIPT_LENGTH} characters'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    user = request.user
+
+    def event_stream():
+        try:
+            for phase, payload in voice_processor.stream_command(user=user, transcript=transcript):
+                yield _sse_event(phase, payload)
+        except Exception as e:
+            logger.exception("Error streaming voice command")
+
+            yield _sse_event('error', {
+                'error': f'Failed to process command: {str(e)}',
+                'response_text': "Sorry, I encountered an error. Could you try again?"
+            })
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _clean_transcript(value) -> str:
+    """
+    Normalize a transcript from the request body.
+
+    NFKC folds compatibility characters (full-width letters, ligatures,
+    non-breaking spaces) into their plain forms so the intent rules and
+    title matching see the same text a user would read. Non-string values
+    become an empty transcript.
+    """
+    if not isinstance(value, str):
+        return ''
+    return unicodedata.normalize('NFKC', value).strip()
+
+
+def _sse_event(event: str, payload) -> bytes:
+    return b'event: ' + event.encode() + b'\ndata: ' + orjson.dumps(payload, default=str) + b'\n\n'
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@renderer_classes([ORJSONRenderer])
 def voice_query(request):
     """
     Answer voice query using contextual data.
@@ -88,7 +320,7 @@ def voice_query(request):
         }
     }
     """
-    query = request.data.get('query', '').strip()
+    query = _clean_transcript(request.data.get('query'))
     context_type = request.data.get('context', 'general')
 
     if not query:
@@ -97,6 +329,12 @@ def voice_query(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
+    if len(query) > MAX_TRANSCRIPT_LENGTH:
+        return Response(
+            {'error': f'query must be at most {MAX_TRANSCRIPT_LENGTH} characters'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
     try:
         # Process as coach query
         result = voice_processor.process_command(
@@ -111,7 +349,7 @@ def voice_query(request):
         })
 
     except Exception as e:
-        print(f"Error processing voice query: {e}")
+        logger.exception("Error processing voice query")
         return Response(
             {'error': f'Failed to process query: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -139,61 +377,10 @@ def voice_capabilities(request):
         ]
     }
     """
-    capabilities = [
-        {
-            "intent": "create_task",
-            "examples": [
-                "Add task review Cambridge application by Friday",
-                "Create task call mentor tomorrow",
-                "Remind me to submit IELTS scores next week"
-            ],
-            "description": "Create a new task with optional deadline and priority"
-        },
-        {
-            "intent": "complete_task",
-            "examples": [
-                "Mark task done: Write SOP",
-                "I completed the research task",
-                "Finished writing my essay"
-            ],
-            "description": "Mark a task as completed"
-        },
-        {
-            "intent": "list_tasks",
-            "examples": [
-                "What's on my agenda today?",
-                "Show my tasks for this week",
-                "What tasks are overdue?"
-            ],
-            "description": "List tasks with optional filters (today, week, overdue)"
-        },
-        {
-            "intent": "coach_query",
-            "examples": [
-                "Coach, am I on track?",
-                "How am I doing?",
-                "What should I focus on?"
-            ],
-            "description": "Ask the adaptive coach for advice"
-        },
-        {
-            "intent": "performance_query",
-            "examples": [
-                "What's my completion rate this week?",
-                "How many tasks did I complete today?",
-                "What's my current streak?"
-            ],
-            "description": "Get performance statistics"
-        },
-        {
-            "intent": "daily_checkin",
-            "examples": [
-                "Start daily check-in",
-                "I completed 3 out of 5 tasks today",
-                "Today was overwhelming"
-            ],
-            "description": "Do daily check-in and get coaching feedback"
-        },
-    ]
+    if request.headers.get('If-None-Match') == _CAPABILITIES_ETAG:
+        return HttpResponseNotModified()
 
-    return Response({"capabilities": capabilities})
+    response = HttpResponse(_CAPABILITIES_JSON, content_type='application/json')
+    response['ETag'] = _CAPABILITIES_ETAG
+    response['Cache-Control'] = 'private, max-age=3600'
+    return response
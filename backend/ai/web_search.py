@@ -2,28 +2,126 @@
 Web Search Service using Tavily API
 Provides intelligent web search capabilities for task enrichment
 """
+import hashlib
+import importlib.util
+import logging
 import os
-from typing import List, Dict, Optional
+import re
+import socket
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Optional, TypedDict
+
+import httpx
 from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+# Identical searches within this window are served from cache
+SEARCH_CACHE_TTL = 60 * 30  # 30 minutes
+SEARCH_CACHE_KEY_PREFIX = 'web_search:'
+
+# Connection pool shared by every search: keep warm connections around long
+# enough to cover bursts of task enrichment, disable Nagle on the small JSON
+# POSTs, and multiplex over HTTP/2 when the h2 extra is installed
+_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60.0)
+_SOCKET_OPTIONS = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+_HTTP2 = importlib.util.find_spec('h2') is not None
+
+# Shared by every caller of search_many, so concurrent enrichment runs reuse
+# the same threads instead of spinning up a pool per request
+_SEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='tavily')
+SEARCH_MANY_TIMEOUT = 30.0
+
+# URL -> platform lookups: one case-insensitive scan instead of lowercasing
+# the URL and running a chain of substring checks
+_EVENT_PLATFORM_RE = re.compile(r'(eventbrite|meetup|luma|linkedin\.com/events)', re.IGNORECASE)
+_EVENT_PLATFORMS = {
+    'eventbrite': 'Eventbrite',
+    'meetup': 'Meetup',
+    'luma': 'Luma',
+    'linkedin.com/events': 'LinkedIn Events',
+}
+_COURSE_PLATFORM_RE = re.compile(
+    r'(coursera|udemy|edx|linkedin\.com/learning|udacity|pluralsight)', re.IGNORECASE
+)
+_COURSE_PLATFORMS = {
+    'coursera': 'Coursera',
+    'udemy': 'Udemy',
+    'edx': 'edX',
+    'linkedin.com/learning': 'LinkedIn Learning',
+    'udacity': 'Udacity',
+    'pluralsight': 'Pluralsight',
+}
+# Default site restriction for course searches without a specific platform
+_COURSE_SITE_FILTER = "site:coursera.org OR site:udemy.com OR site:edx.org OR site:linkedin.com/learning"
+# LinkedIn titles look like "Name - Title at Company | LinkedIn"; the name is
+# everything before the first " - ", or before the first " | " if there is
+# no " - " at all (the first alternative is tried across the whole title first)
+_LINKEDIN_NAME_RE = re.compile(r'^(.*?) - |^(.*?) \| ', re.DOTALL)
+
+
+# Result row shapes. These stay plain dicts at runtime: TaskAgent feeds
+# search results straight into json.dumps() for its prompts, so rows must
+# serialize as objects, not arrays.
+class LinkedInProfile(TypedDict):
+    name: str
+    url: str
+    title: str
+    snippet: str
+    source: str
+
+
+class EventResult(TypedDict):
+    name: str
+    url: str
+    description: str
+    snippet: str
+    source: str
+
+
+class CourseResult(TypedDict):
+    name: str
+    url: str
+    description: str
+    platform: str
+    snippet: str
+
+
+class GeneralResult(TypedDict):
+    title: str
+    url: str
+    content: str
+    snippet: str
 
 
 class WebSearchService:
     """Web search service for finding real-world information"""
 
     def __init__(self):
-        """Initialize Tavily client"""
-        try:
-            from tavily import TavilyClient
-            api_key = settings.TAVILY_API_KEY
-
-            if not api_key:
-                print("WARNING: TAVILY_API_KEY not set. Web search will be disabled.")
-                self.client = None
-            else:
-                self.client = TavilyClient(api_key=api_key)
-        except ImportError:
-            print("WARNING: tavily-python not installed. Run: pip install tavily-python")
+        """Initialize Tavily HTTP client"""
+        # Single-flight table: cache key -> Future of the search already running
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+        self.api_key = settings.TAVILY_API_KEY
+
+        if not self.api_key:
+            logger.warning("TAVILY_API_KEY not set. Web search will be disabled.")
             self.client = None
+        else:
+            # Talk to the REST API directly over one pooled keep-alive client,
+            # rather than through TavilyClient's per-call requests overhead
+            self.client = httpx.Client(
+                headers={'Authorization': f'Bearer {self.api_key}'},
+                timeout=30.0,
+                transport=httpx.HTTPTransport(
+                    limits=_HTTP_LIMITS, http2=_HTTP2, socket_options=_SOCKET_OPTIONS
+                ),
+            )
 
     def is_available(self) -> bool:
         """Check if web search is available"""
@@ -35,7 +133,7 @@ class WebSearchService:
         industry: str = "",
         location: str = "",
         max_results: int = 5
-    ) -> List[Dict]:
+    ) -> List[LinkedInProfile]:
         """
         Search for relevant professionals on LinkedIn
 
@@ -52,29 +150,10 @@ class WebSearchService:
             return []
 
         try:
-            # Build search query optimized for LinkedIn
-            search_query = f"{query} {industry} {location} site:linkedin.com/in".strip()
-
-            response = self.client.search(
-                query=search_query,
-                max_results=max_results,
-                search_depth="basic"
-            )
-
-            # Parse results
-            profiles = []
-            for result in response.get('results', []):
-                profiles.append({
-                    'name': self._extract_name_from_linkedin_title(result.get('title', '')),
-                    'url': result.get('url', ''),
-                    'title': result.get('title', ''),
-                    'snippet': result.get('content', ''),
-                    'source': 'linkedin'
-                })
-
-            return profiles
-        except Exception as e:
-            print(f"LinkedIn search error: {e}")
+            response = self._search(self._linkedin_params(query, industry, location, max_results))
+            return self._parse_linkedin(response)
+        except Exception:
+            logger.exception("LinkedIn search error")
             return []
 
     def search_events(
@@ -83,7 +162,7 @@ class WebSearchService:
         location: str = "",
         timeframe: str = "2025",
         max_results: int = 5
-    ) -> List[Dict]:
+    ) -> List[EventResult]:
         """
         Search for upcoming industry events
 
@@ -100,29 +179,10 @@ class WebSearchService:
             return []
 
         try:
-            # Build search query for events
-            search_query = f"{industry} events {location} {timeframe} conference meetup"
-
-            response = self.client.search(
-                query=search_query,
-                max_results=max_results,
-                search_depth="advanced"  # More comprehensive for events
-            )
-
-            # Parse results
-            events = []
-            for result in response.get('results', []):
-                events.append({
-                    'name': result.get('title', ''),
-                    'url': result.get('url', ''),
-                    'description': result.get('content', ''),
-                    'snippet': result.get('content', ''),
-                    'source': self._identify_event_platform(result.get('url', ''))
-                })
-
-            return events
-        except Exception as e:
-            print(f"Events search error: {e}")
+            response = self._search(self._events_params(industry, location, timeframe, max_results))
+            return self._parse_events(response)
+        except Exception:
+            logger.exception("Events search error")
             return []
 
     def search_courses(
@@ -131,7 +191,7 @@ class WebSearchService:
         level: str = "intermediate",
         platform: Optional[str] = None,
         max_results: int = 5
-    ) -> List[Dict]:
+    ) -> List[CourseResult]:
         """
         Search for online courses
 
@@ -148,33 +208,10 @@ class WebSearchService:
             return []
 
         try:
-            # Build search query for courses
-            if platform:
-                search_query = f"{topic} {level} course site:{platform}.com"
-            else:
-                platforms = "site:coursera.org OR site:udemy.com OR site:edx.org OR site:linkedin.com/learning"
-                search_query = f"{topic} {level} course {platforms}"
-
-            response = self.client.search(
-                query=search_query,
-                max_results=max_results,
-                search_depth="basic"
-            )
-
-            # Parse results
-            courses = []
-            for result in response.get('results', []):
-                courses.append({
-                    'name': result.get('title', ''),
-                    'url': result.get('url', ''),
-                    'description': result.get('content', ''),
-                    'platform': self._identify_course_platform(result.get('url', '')),
-                    'snippet': result.get('content', '')
-                })
-
-            return courses
-        except Exception as e:
-            print(f"Courses search error: {e}")
+            response = self._search(self._courses_params(topic, level, platform, max_results))
+            return self._parse_courses(response)
+        except Exception:
+            logger.exception("Courses search error")
             return []
 
     def search_general(
@@ -182,7 +219,7 @@ class WebSearchService:
         query: str,
         max_results: int = 5,
         search_depth: str = "basic"
-    ) -> List[Dict]:
+    ) -> List[GeneralResult]:
         """
         General web search
 
@@ -198,64 +235,224 @@ class WebSearchService:
             return []
 
         try:
-            response = self.client.search(
-                query=query,
-                max_results=max_results,
-                search_depth=search_depth
-            )
+            response = self._search(self._general_params(query, max_results, search_depth))
+            return self._parse_general(response)
+        except Exception:
+            logger.exception("General search error")
+            return []
+
+    def search_many(self, specs: List[Dict]) -> List[List[Dict]]:
+        """
+        Run several searches concurrently on the shared thread pool
+
+        Args:
+            specs: List of search specs, each with a "type" ("linkedin",
+                "events", "courses" or "general") plus that search's keyword
+                arguments, e.g. {"type": "events", "industry": "fintech"}
+
+        Each spec goes through the regular sync search methods, so it works
+        from any thread without an event loop and shares their cache and
+        single-flight. Each search blocks on network I/O with the GIL released, so
+        the batch takes roughly as long as its slowest search.
 
-            results = []
-            for result in response.get('results', []):
-                results.append({
-                    'title': result.get('title', ''),
-                    'url': result.get('url', ''),
-                    'content': result.get('content', ''),
-                    'snippet': result.get('content', '')
-                })
+        Returns:
+            One result list per spec, in the same order; a failed or
+            timed-out search yields an empty list
+        """
+        futures = [_SEARCH_EXECUTOR.submit(self._run_spec, spec) for spec in specs]
+
+        results = []
+        for spec, future in zip(specs, futures):
+            try:
+                results.append(future.result(timeout=SEARCH_MANY_TIMEOUT))
+            except Exception:
+                logger.exception("Search '%s' failed", spec.get('type', 'general'))
+                results.append([])
+        return results
+
+    def _run_spec(self, spec: Dict) -> List[Dict]:
+        """Dispatch a search spec to the matching sync search method"""
+        kwargs = {key: value for key, value in spec.items() if key != 'type'}
+        search_type = spec.get('type', 'general')
+        if search_type == 'linkedin':
+            return self.search_linkedin_profiles(**kwargs)
+        if search_type == 'events':
+            return self.search_events(**kwargs)
+        if search_type == 'courses':
+            return self.search_courses(**kwargs)
+        return self.search_general(**kwargs)
+
+    def _search(self, params: Dict) -> Dict:
+        """Run a Tavily search, serving repeats of the same query from cache"""
+        key = self._cache_key(params)
+        response = cache.get(key)
+        if response is not None:
+            return response
+
+        # Coalesce concurrent identical searches into one Tavily call
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not is_leader:
+            return future.result()
 
-            return results
+        try:
+            response = self._raw_search(params)
+            cache.set(key, response, SEARCH_CACHE_TTL)
+            future.set_result(response)
+            return response
         except Exception as e:
-            print(f"General search error: {e}")
-            return []
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _raw_search(self, params: Dict) -> Dict:
+        """POST a single search to Tavily and return the decoded JSON body"""
+        response = self.client.post(TAVILY_SEARCH_URL, json=params)
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _cache_key(params: Dict) -> str:
+        """Stable cache key from normalized query + depth + max_results"""
+        raw = f"{params['query'].strip().lower()}|{params['search_depth']}|{params['max_results']}"
+        return SEARCH_CACHE_KEY_PREFIX + hashlib.md5(raw.encode()).hexdigest()
+
+    # Request builders: one per search type, shared by every search type's sync method
+
+    def _linkedin_params(
+        self,
+        query: str,
+        industry: str = "",
+        location: str = "",
+        max_results: int = 5
+    ) -> Dict:
+        # Build search query optimized for LinkedIn
+        return {
+            'query': f"{query} {industry} {location} site:linkedin.com/in".strip(),
+            'max_results': max_results,
+            'search_depth': "basic",
+        }
+
+    def _events_params(
+        self,
+        industry: str,
+        location: str = "",
+        timeframe: str = "2025",
+        max_results: int = 5
+    ) -> Dict:
+        return {
+            'query': f"{industry} events {location} {timeframe} conference meetup",
+            'max_results': max_results,
+            'search_depth': "advanced",  # More comprehensive for events
+        }
+
+    def _courses_params(
+        self,
+        topic: str,
+        level: str = "intermediate",
+        platform: Optional[str] = None,
+        max_results: int = 5
+    ) -> Dict:
+        if platform:
+            search_query = f"{topic} {level} course site:{platform}.com"
+        else:
+            search_query = f"{topic} {level} course {_COURSE_SITE_FILTER}"
+        return {
+            'query': search_query,
+            'max_results': max_results,
+            'search_depth': "basic",
+        }
+
+    def _general_params(
+        self,
+        query: str,
+        max_results: int = 5,
+        search_depth: str = "basic"
+    ) -> Dict:
+        return {
+            'query': query,
+            'max_results': max_results,
+            'search_depth': search_depth,
+        }
+
+    # Response parsers: shape raw Tavily results per search type
+
+    def _parse_linkedin(self, response: Dict) -> List[LinkedInProfile]:
+        profiles = []
+        for result in response.get('results', []):
+            title = result.get('title', '')
+            profiles.append({
+                'name': self._extract_name_from_linkedin_title(title),
+                'url': result.get('url', ''),
+                'title': title,
+                'snippet': result.get('content', ''),
+                'source': 'linkedin'
+            })
+        return profiles
+
+    def _parse_events(self, response: Dict) -> List[EventResult]:
+        events = []
+        for result in response.get('results', []):
+            url = result.get('url', '')
+            content = result.get('content', '')
+            events.append({
+                'name': result.get('title', ''),
+                'url': url,
+                'description': content,
+                'snippet': content,
+                'source': self._identify_event_platform(url)
+            })
+        return events
+
+    def _parse_courses(self, response: Dict) -> List[CourseResult]:
+        courses = []
+        for result in response.get('results', []):
+            url = result.get('url', '')
+            content = result.get('content', '')
+            courses.append({
+                'name': result.get('title', ''),
+                'url': url,
+                'description': content,
+                'platform': self._identify_course_platform(url),
+                'snippet': content
+            })
+        return courses
+
+    def _parse_general(self, response: Dict) -> List[GeneralResult]:
+        results = []
+        for result in response.get('results', []):
+            content = result.get('content', '')
+            results.append({
+                'title': result.get('title', ''),
+                'url': result.get('url', ''),
+                'content': content,
+                'snippet': content
+            })
+        return results
 
     def _extract_name_from_linkedin_title(self, title: str) -> str:
         """Extract person's name from LinkedIn page title"""
-        # LinkedIn titles are usually in format: "Name - Title at Company | LinkedIn"
-        if ' - ' in title:
-            return title.split(' - ')[0].strip()
-        elif ' | ' in title:
-            return title.split(' | ')[0].strip()
+        match = _LINKEDIN_NAME_RE.match(title)
+        if match:
+            return (match.group(1) if match.group(1) is not None else match.group(2)).strip()
         return title.strip()
 
     def _identify_event_platform(self, url: str) -> str:
         """Identify event platform from URL"""
-        url_lower = url.lower()
-        if 'eventbrite' in url_lower:
-            return 'Eventbrite'
-        elif 'meetup' in url_lower:
-            return 'Meetup'
-        elif 'luma' in url_lower:
-            return 'Luma'
-        elif 'linkedin.com/events' in url_lower:
-            return 'LinkedIn Events'
-        return 'Other'
+        match = _EVENT_PLATFORM_RE.search(url)
+        return _EVENT_PLATFORMS[match.group(1).lower()] if match else 'Other'
 
     def _identify_course_platform(self, url: str) -> str:
         """Identify course platform from URL"""
-        url_lower = url.lower()
-        if 'coursera' in url_lower:
-            return 'Coursera'
-        elif 'udemy' in url_lower:
-            return 'Udemy'
-        elif 'edx' in url_lower:
-            return 'edX'
-        elif 'linkedin.com/learning' in url_lower:
-            return 'LinkedIn Learning'
-        elif 'udacity' in url_lower:
-            return 'Udacity'
-        elif 'pluralsight' in url_lower:
-            return 'Pluralsight'
-        return 'Other'
+        match = _COURSE_PLATFORM_RE.search(url)
+        return _COURSE_PLATFORMS[match.group(1).lower()] if match else 'Other'
 
 
 # Singleton instance
@@ -4,17 +4,30 @@ Context-Aware Daily Pulse API Views
 Enhanced Daily Pulse that uses performance insights.
 """
 
+import hashlib
+import logging
+
 from rest_framework import permissions, status
 from rest_framework.response import Response
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from django.core.cache import cache
 from django.utils import timezone
 
 from ai.contextual_pulse_generator import contextual_pulse_generator
+from ai.renderers import ORJSONRenderer
 from todos.models import Todo
 
+logger = logging.getLogger(__name__)
+
+# Repeat refreshes of the same morning's pulse are served from cache; the key
+# includes every task's id and updated_at, so any task change regenerates it
+PULSE_CACHE_TTL = 60 * 10  # 10 minutes
+PULSE_CACHE_KEY_PREFIX = 'contextual_pulse:'
+
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
+@renderer_classes([ORJSONRenderer])
 def generate_contextual_pulse(request):
     """
     Generate context-aware Daily Pulse using performance insights.
@@ -52,14 +65,20 @@ def generate_contextual_pulse(request):
     user = request.user
     today = timezone.now().date()
 
-    # Get today's tasks
-    daily_tasks = Todo.objects.filter(
+    # Get today's tasks. The pulse generator only reads these columns and
+    # touches no relations, so defer everything else (descriptions, notes,
+    # JSON evidence fields) to keep the row payload small.
+    daily_tasks = Todo.objects.only(
+        'id', 'title', 'priority', 'timebox_minutes', 'status',
+        'scheduled_date', 'scheduled_time', 'is_quick_win', 'updated_at'
+    ).filter(
         user=user,
         scheduled_date=today,
         status__in=['ready', 'in_progress']
     ).order_by('-priority', 'scheduled_time')
+    tasks = list(daily_tasks)
 
-    if not daily_tasks.exists():
+    if not tasks:
         return Response({
             "message": "No tasks scheduled for today",
             "greeting_message": "☀️ You have a free day! Consider planning ahead.",
@@ -77,21 +96,33 @@ def generate_contextual_pulse(request):
             "generated_at": timezone.now().isoformat(),
         })
 
+    cache_key = _pulse_cache_key(user.id, today, tasks)
+    pulse = cache.get(cache_key)
+    if pulse is not None:
+        return Response(pulse)
+
     try:
         # Generate context-aware pulse
         pulse = contextual_pulse_generator.generate_contextual_pulse(
             user=user,
-            daily_tasks=list(daily_tasks)
+            daily_tasks=tasks
         )
 
+        cache.set(cache_key, pulse, PULSE_CACHE_TTL)
         return Response(pulse)
 
     except Exception as e:
-        print(f"Error generating contextual pulse: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error generating contextual pulse")
 
         return Response(
             {'error': f'Failed to generate pulse: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+
+
+def _pulse_cache_key(user_id, today, tasks) -> str:
+    """Cache key for a user's pulse over a specific set of task versions"""
+    task_hash = hashlib.blake2b(digest_size=8)
+    for task in tasks:
+        task_hash.update(f"{task.id}:{task.updated_at.isoformat()};".encode())
+    return f"{PULSE_CACHE_KEY_PREFIX}{user_id}:{today.isoformat()}:{task_hash.hexdigest()}"
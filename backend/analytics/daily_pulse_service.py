@@ -9,10 +9,12 @@ Generates personalized daily briefs with 6 blocks:
 5. 💡 Smart Suggestions
 6. 📈 Weekly Progress
 """
+import io
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
+from django.db import IntegrityError, transaction
 from django.utils import timezone
-from django.db.models import Count, Sum, Q, Avg
+from django.db.models import Avg
 from collections import defaultdict
 
 from .models import DailyBrief, UserBehaviorPattern
@@ -21,6 +23,42 @@ from users.models import User, GoalSpec
 from users.models import UserProfile
 
 
+# Russian category labels used in warnings and the category balance tip
+_CATEGORY_RU = {
+    'study': 'учёба',
+    'career': 'карьера',
+    'sport': 'спорт',
+    'health': 'здоровье',
+    'finance': 'финансы',
+    'creative': 'творчество',
+    'admin': 'админ',
+    'other': 'другое'
+}
+
+# Alternative time slot suggested for a slot with a high skip rate
+_BETTER_TIME = {
+    'evening': 'утром (9-11 am)',
+    'night': 'днём (2-4 pm)',
+    'morning': 'днём (12-2 pm)',
+    'afternoon': 'утром (8-10 am)'
+}
+
+# Workload status labels and emoji for the full message
+_WORKLOAD_STATUS_TEXT = {
+    'light': 'лёгкий день',
+    'optimal': 'оптимально',
+    'heavy': 'насыщенный день',
+    'overloaded': 'перегрузка'
+}
+
+_WORKLOAD_EMOJI = {
+    'light': '😌',
+    'optimal': '⚡',
+    'heavy': '💪',
+    'overloaded': '⚠️'
+}
+
+
 class DailyPulseGenerator:
     """
     Generates daily morning briefs for users
@@ -30,18 +68,70 @@ class DailyPulseGenerator:
         brief = generator.generate_daily_brief()
     """
 
-    def __init__(self, user: User):
+    def __init__(self, user: User, available_minutes: Optional[int] = None):
         self.user = user
         self.today = timezone.now().date()
         self.now = timezone.now()
+        self.week_start = self.today - timedelta(days=self.today.weekday())
+
+        self._active_goals = None
+
+        # Filled in by bulk_generate() so the blocks skip their own queries
+        self._window_tasks = None
+        self._ready_blocked_tasks = None
+        self._open_blocker_keys = None
+        self._failure_patterns = None
+
+        # Without a profile flag to go by, behavior patterns are looked up
+        self.has_behavior_patterns = True
+
+        if available_minutes is not None:
+            self.available_minutes = available_minutes
+            return
 
         # Get user profile
         try:
             self.profile = UserProfile.objects.get(user=user)
             self.available_minutes = getattr(self.profile, 'daily_available_minutes', 480)
+            self.has_behavior_patterns = self.profile.has_behavior_patterns
         except UserProfile.DoesNotExist:
             self.available_minutes = 480  # Default 8 hours
 
+    @property
+    def active_goals(self) -> List[GoalSpec]:
+        """User's active goals, loaded once per generator"""
+        if self._active_goals is None:
+            self._active_goals = list(GoalSpec.objects.filter(
+                user=self.user,
+                is_active=True
+            ).only('id', 'category', 'target_date'))
+        return self._active_goals
+
+    def _load_window_tasks(self) -> List[Todo]:
+        """
+        Load every task the date-bounded blocks read, in one query.
+
+        The window runs from the start of the week (or 3 days back, whichever
+        is earlier) through today+2; generate_daily_brief slices it per block.
+        """
+        if self._window_tasks is None:
+            self._window_tasks = list(self._window_tasks_queryset(user=self.user))
+        return self._window_tasks
+
+    def _window_tasks_queryset(self, **filters):
+        """Tasks in the brief's date window, narrowed by the given filters"""
+        window_start = min(self.week_start, self.today - timedelta(days=3))
+        return Todo.objects.filter(
+            scheduled_date__gte=window_start,
+            scheduled_date__lte=self.today + timedelta(days=2),
+            **filters
+        ).select_related('goalspec').only(
+            'id', 'user', 'title', 'scheduled_date', 'scheduled_time', 'external_url',
+            'priority', 'status', 'timebox_minutes', 'contribution_weight', 'energy_level',
+            'goalspec__id', 'goalspec__category', 'goalspec__is_active', 'goalspec__target_date',
+            'goalspec__priority_weight', 'goalspec__created_at'
+        )
+
     def generate_daily_brief(self, trigger: str = 'scheduled') -> Optional[DailyBrief]:
         """
         Generate complete daily brief
@@ -52,34 +142,174 @@ class DailyPulseGenerator:
         Returns:
             DailyBrief instance or None if generation fails
         """
-        # Check if brief already exists
-        existing = DailyBrief.objects.filter(
-            user=self.user,
-            date=self.today
-        ).first()
+        # Only the on_login trigger reuses or replaces an existing brief, and
+        # deciding that needs just the fields should_regenerate() reads
+        if trigger == 'on_login':
+            existing = DailyBrief.objects.filter(
+                user=self.user,
+                date=self.today
+            ).only('id', 'regenerated_at').first()
+
+            if existing:
+                # Check if should regenerate
+                if not existing.should_regenerate():
+                    return DailyBrief.objects.get(pk=existing.pk)
+                # Regenerate
+                existing.delete()
+
+        brief = self._build_brief(trigger)
+        brief.save(force_insert=True)
+
+        return brief
+
+    @classmethod
+    def bulk_generate(
+        cls,
+        users: List[User],
+        trigger: str = 'scheduled'
+    ) -> Tuple[List[DailyBrief], List[Dict]]:
+        """
+        Generate today's brief for many users with a fixed number of queries
 
-        if existing and trigger == 'on_login':
-            # Check if should regenerate
-            if not existing.should_regenerate():
-                return existing
-            # Regenerate
-            existing.delete()
+        Every query a single brief needs is issued once for the whole batch
+        and bucketed by user; users who already have a brief for today are
+        skipped. Briefs are written with one bulk_create; if a concurrent
+        run inserted some of them first, the rest are saved one by one.
+
+        Returns:
+            (created briefs, [{'user_id', 'error'}] for users that failed)
+        """
+        users = list(users)
+        if not users:
+            return [], []
+
+        user_ids = [user.id for user in users]
+        today = timezone.now().date()
+
+        existing_ids = set(DailyBrief.objects.filter(
+            user_id__in=user_ids,
+            date=today
+        ).values_list('user_id', flat=True))
+        users = [user for user in users if user.id not in existing_ids]
+        if not users:
+            return [], []
+        user_ids = [user.id for user in users]
+
+        profiles = {
+            user_id: (minutes, has_patterns)
+            for user_id, minutes, has_patterns in UserProfile.objects.filter(
+                user_id__in=user_ids
+            ).values_list('user_id', 'daily_available_minutes', 'has_behavior_patterns')
+        }
+
+        generators = []
+        for user in users:
+            minutes, has_patterns = profiles.get(user.id, (480, True))
+            generator = cls(user, available_minutes=minutes)
+            generator.has_behavior_patterns = has_patterns
+            generators.append(generator)
+        by_user = {generator.user.id: generator for generator in generators}
+        for generator in generators:
+            generator._window_tasks = []
+            generator._active_goals = []
+            generator._ready_blocked_tasks = []
+            generator._failure_patterns = []
+
+        # The date window only depends on the clock, so any generator in the
+        # batch can build the shared queryset
+        for task in generators[0]._window_tasks_queryset(user_id__in=user_ids):
+            by_user[task.user_id]._window_tasks.append(task)
+
+        for goal in GoalSpec.objects.filter(
+            user_id__in=user_ids,
+            is_active=True
+        ).only('id', 'user', 'category', 'target_date'):
+            by_user[goal.user_id]._active_goals.append(goal)
+
+        for task in Todo.objects.filter(
+            user_id__in=user_ids,
+            status='ready',
+            blocked_by__isnull=False
+        ).exclude(blocked_by=[]).only('id', 'user', 'title', 'blocked_by'):
+            ready_blocked = by_user[task.user_id]._ready_blocked_tasks
+            if len(ready_blocked) < 2:  # Max 2
+                ready_blocked.append(task)
+
+        # Keys carry the user id, so one set serves every generator
+        open_blocker_keys = Todo.open_blocker_keys([
+            task for generator in generators for task in generator._ready_blocked_tasks
+        ])
+        for generator in generators:
+            generator._open_blocker_keys = open_blocker_keys
+
+        for pattern in UserBehaviorPattern.objects.filter(
+            user_id__in=[generator.user.id for generator in generators if generator.has_behavior_patterns],
+            pattern_type='failure_time',
+            is_active=True
+        ).order_by('-confidence_score'):
+            by_user[pattern.user_id]._failure_patterns.append(pattern)
+
+        briefs = []
+        errors = []
+        for generator in generators:
+            try:
+                briefs.append(generator._build_brief(trigger))
+            except Exception as e:
+                errors.append({
+                    'user_id': generator.user.id,
+                    'error': str(e)
+                })
+
+        try:
+            with transaction.atomic():
+                return DailyBrief.objects.bulk_create(briefs), errors
+        except IntegrityError:
+            return cls._save_briefs_individually(briefs), errors
+
+    @staticmethod
+    def _save_briefs_individually(briefs: List[DailyBrief]) -> List[DailyBrief]:
+        """Save briefs one at a time, skipping users that already have today's"""
+        existing_ids = set(DailyBrief.objects.filter(
+            user_id__in=[brief.user_id for brief in briefs],
+            date__in={brief.date for brief in briefs}
+        ).values_list('user_id', flat=True))
+
+        created = []
+        for brief in briefs:
+            if brief.user_id in existing_ids:
+                continue
+            try:
+                with transaction.atomic():
+                    brief.save(force_insert=True)
+            except IntegrityError:
+                continue
+            created.append(brief)
+        return created
+
+    def _build_brief(self, trigger: str) -> DailyBrief:
+        """Build an unsaved brief from all six blocks"""
+        # Fetch the task window once and hand each block its slice
+        tasks = self._load_window_tasks()
+        three_days_ago = self.today - timedelta(days=3)
+        today_tasks = [task for task in tasks if task.scheduled_date == self.today]
+        upcoming_tasks = [task for task in tasks if task.scheduled_date >= self.today]
+        week_tasks = [task for task in tasks if self.week_start <= task.scheduled_date <= self.today]
+        recent_tasks = [task for task in tasks if three_days_ago <= task.scheduled_date <= self.today]
 
         # Generate all blocks
         greeting = self._generate_greeting()
-        priorities = self._select_top_priorities()
-        workload = self._calculate_workload()
-        warnings = self._generate_warnings()
-        suggestions = self._generate_smart_suggestions()
-        weekly_progress = self._calculate_weekly_progress()
+        priorities = self._select_top_priorities(today_tasks)
+        workload = self._calculate_workload(today_tasks)
+        warnings = self._generate_warnings(week_tasks, upcoming_tasks)
+        suggestions = self._generate_smart_suggestions(recent_tasks, today_tasks, workload)
+        weekly_progress = self._calculate_weekly_progress(week_tasks)
 
         # Format full message
         full_message = self._format_full_message(
             greeting, priorities, workload, warnings, suggestions, weekly_progress
         )
 
-        # Create brief
-        brief = DailyBrief.objects.create(
+        return DailyBrief(
             user=self.user,
             date=self.today,
             greeting_message=greeting,
@@ -95,8 +325,6 @@ class DailyPulseGenerator:
             generation_trigger=trigger
         )
 
-        return brief
-
     # ==========================================
     # Block 1: 🕐 Greeting
     # ==========================================
@@ -130,59 +358,68 @@ class DailyPulseGenerator:
     # Block 2: 🎯 Priorities
     # ==========================================
 
-    def _select_top_priorities(self) -> List[Dict]:
+    def _select_top_priorities(self, today_tasks: List[Todo]) -> List[Dict]:
         """Select top 2-3 priority tasks for today"""
-        # Get today's tasks
-        tasks = Todo.objects.filter(
-            user=self.user,
-            scheduled_date=self.today,
-            status__in=['ready', 'pending', 'in_progress']
-        ).select_related('goalspec')
+        # Today's open tasks come from the shared task window (the same rows
+        # the workload block sums), so ranking them needs no query
+        tasks = [task for task in today_tasks if task.status in ('ready', 'pending', 'in_progress')]
 
         if not tasks:
             return []
 
-        # Score each task
-        scored_tasks = []
-        for task in tasks:
-            score = self._calculate_priority_score(task)
-            scored_tasks.append((task, score))
+        # Days until the goal deadline, computed once per task for the score,
+        # the reason and the payload (None when there is no deadline)
+        days_until = {
+            task.id: (
+                (task.goalspec.target_date - self.today).days
+                if task.goalspec_id and task.goalspec.target_date is not None
+                else None
+            )
+            for task in tasks
+        }
 
-        # Sort by score
-        scored_tasks.sort(key=lambda x: x[1], reverse=True)
+        # Sort by score; the sort is stable, so ties keep Todo's default ordering
+        scored_tasks = sorted(
+            tasks,
+            key=lambda task: self._calculate_priority_score(task, days_until[task.id]),
+            reverse=True
+        )
 
         # Select top 2-3
         top_tasks = []
-        for task, score in scored_tasks[:3]:
+        for task in scored_tasks[:3]:
+            task_days_until = days_until[task.id]
             priority_info = {
                 'task_id': task.id,
                 'title': task.title,
-                'reason': self._get_priority_reason(task),
+                'reason': self._get_priority_reason(task, task_days_until),
                 'timebox_minutes': task.timebox_minutes,
                 'priority_level': task.priority,
             }
 
             # Add deadline if close
-            if task.goalspec and hasattr(task.goalspec, 'target_date') and task.goalspec.target_date:
-                days_until = (task.goalspec.target_date - self.today).days
-                if days_until <= 3:
-                    priority_info['deadline'] = task.goalspec.target_date.isoformat()
-                    priority_info['days_until_deadline'] = days_until
+            if task_days_until is not None and task_days_until <= 3:
+                priority_info['deadline'] = task.goalspec.target_date.isoformat()
+                priority_info['days_until_deadline'] = task_days_until
 
             top_tasks.append(priority_info)
 
         return top_tasks
 
-    def _calculate_priority_score(self, task: Todo) -> float:
-        """Calculate priority score for a task"""
+    def _calculate_priority_score(self, task: Todo, days_until: Optional[int]) -> float:
+        """
+        Calculate priority score for a task
+
+        Args:
+            days_until: Days until the task's goal deadline, None if it has none
+        """
         score = 0.0
 
         # Priority level (most important)
         score += task.priority * 30
 
         # Deadline proximity
-        if task.goalspec and hasattr(task.goalspec, 'target_date') and task.goalspec.target_date:
-            days_until = (task.goalspec.target_date - self.today).days
+        if days_until is not None:
             if days_until <= 1:
                 score += 40
             elif days_until <= 3:
@@ -203,8 +440,13 @@ class DailyPulseGenerator:
 
         return score
 
-    def _get_priority_reason(self, task: Todo) -> str:
-        """Get human-readable reason why task is priority"""
+    def _get_priority_reason(self, task: Todo, days_until: Optional[int]) -> str:
+        """
+        Get human-readable reason why task is priority
+
+        Args:
+            days_until: Days until the task's goal deadline, None if it has none
+        """
         reasons = []
 
         if task.priority == 3:
@@ -213,8 +455,7 @@ class DailyPulseGenerator:
         if task.is_overdue:
             reasons.append("просрочено")
 
-        if task.goalspec and hasattr(task.goalspec, 'target_date') and task.goalspec.target_date:
-            days_until = (task.goalspec.target_date - self.today).days
+        if days_until is not None:
             if days_until == 0:
                 reasons.append("deadline сегодня")
             elif days_until == 1:
@@ -231,19 +472,11 @@ class DailyPulseGenerator:
     # Block 3: 📊 Workload
     # ==========================================
 
-    def _calculate_workload(self) -> Dict:
+    def _calculate_workload(self, today_tasks: List[Todo]) -> Dict:
         """Calculate daily workload metrics"""
-        # Get today's tasks
-        tasks = Todo.objects.filter(
-            user=self.user,
-            scheduled_date=self.today,
-            status__in=['ready', 'pending', 'in_progress']
-        )
-
-        # Sum timebox minutes
-        total_minutes = tasks.aggregate(
-            total=Sum('timebox_minutes')
-        )['total'] or 0
+        # Get today's open tasks
+        tasks = [task for task in today_tasks if task.status in ('ready', 'pending', 'in_progress')]
+        total_minutes = sum(task.timebox_minutes or 0 for task in tasks)
 
         # Calculate percentage
         percentage = int((total_minutes / self.available_minutes) * 100) if self.available_minutes > 0 else 0
@@ -263,23 +496,23 @@ class DailyPulseGenerator:
             'status': status,
             'total_minutes': total_minutes,
             'available_minutes': self.available_minutes,
-            'task_count': tasks.count()
+            'task_count': len(tasks)
         }
 
     # ==========================================
     # Block 4: ⚠️ Warnings/Reminders
     # ==========================================
 
-    def _generate_warnings(self) -> List[Dict]:
+    def _generate_warnings(self, week_tasks: List[Todo], upcoming_tasks: List[Todo]) -> List[Dict]:
         """Generate warnings and reminders"""
         warnings = []
 
         # Check low progress by category
-        low_progress_warnings = self._check_low_category_progress()
+        low_progress_warnings = self._check_low_category_progress(week_tasks)
         warnings.extend(low_progress_warnings)
 
         # Check upcoming deadlines
-        deadline_warnings = self._check_upcoming_deadlines()
+        deadline_warnings = self._check_upcoming_deadlines(upcoming_tasks)
         warnings.extend(deadline_warnings)
 
         # Check blocked tasks that became ready
@@ -287,7 +520,7 @@ class DailyPulseGenerator:
         warnings.extend(unblocked_warnings)
 
         # Check important events today
-        event_warnings = self._check_today_events()
+        event_warnings = self._check_today_events(upcoming_tasks)
         warnings.extend(event_warnings)
 
         # Sort by severity
@@ -295,52 +528,47 @@ class DailyPulseGenerator:
 
         return warnings[:5]  # Max 5 warnings
 
-    def _check_low_category_progress(self) -> List[Dict]:
+    def _check_low_category_progress(self, week_tasks: List[Todo]) -> List[Dict]:
         """Check categories with 0% progress this week"""
         warnings = []
 
-        week_start = self.today - timedelta(days=self.today.weekday())
-
-        # Get all goals
-        goals = GoalSpec.objects.filter(
-            user=self.user,
-            is_active=True
+        # Done count per active goal with tasks this week; goals without any
+        # tasks this week get no entry, same as total == 0
+        goal_stats = {}
+        for task in week_tasks:
+            goal = task.goalspec
+            if goal is None or not goal.is_active:
+                continue
+            stats = goal_stats.setdefault(goal.id, {'goal': goal, 'completed': 0})
+            if task.status == 'done':
+                stats['completed'] += 1
+
+        # Ordered like GoalSpec's default ordering so warnings keep their order
+        goal_rows = sorted(
+            goal_stats.values(),
+            key=lambda stats: (stats['goal'].priority_weight, stats['goal'].created_at),
+            reverse=True
         )
 
-        for goal in goals:
-            # Count tasks for this category this week
-            tasks = Todo.objects.filter(
-                user=self.user,
-                goalspec=goal,
-                scheduled_date__gte=week_start,
-                scheduled_date__lte=self.today
-            )
-
-            total = tasks.count()
-            completed = tasks.filter(status='done').count()
-
-            if total > 0 and completed == 0:
-                category_name = self._translate_category(goal.category)
+        for row in goal_rows:
+            if row['completed'] == 0:
+                category = row['goal'].category
+                category_name = self._translate_category(category)
                 warnings.append({
                     'type': 'low_progress',
-                    'category': goal.category,
+                    'category': category,
                     'message': f"{category_name} 0% прогресса за неделю",
                     'severity': 'medium'
                 })
 
         return warnings
 
-    def _check_upcoming_deadlines(self) -> List[Dict]:
+    def _check_upcoming_deadlines(self, upcoming_tasks: List[Todo]) -> List[Dict]:
         """Check tasks with close deadlines"""
         warnings = []
 
-        # Get tasks with external URLs (interviews, meetings)
-        tasks_with_events = Todo.objects.filter(
-            user=self.user,
-            scheduled_date__gte=self.today,
-            scheduled_date__lte=self.today + timedelta(days=2),
-            external_url__isnull=False
-        ).exclude(external_url='')
+        # Tasks with external URLs (interviews, meetings)
+        tasks_with_events = [task for task in upcoming_tasks if task.external_url]
 
         for task in tasks_with_events:
             days_until = (task.scheduled_date - self.today).days
@@ -370,14 +598,26 @@ class DailyPulseGenerator:
         warnings = []
 
         # Get recently unblocked tasks
-        ready_tasks = Todo.objects.filter(
-            user=self.user,
-            status='ready',
-            blocked_by__isnull=False
-        ).exclude(blocked_by=[])
+        if self._ready_blocked_tasks is not None:
+            ready_tasks = self._ready_blocked_tasks
+        else:
+            ready_tasks = list(Todo.objects.filter(
+                user=self.user,
+                status='ready',
+                blocked_by__isnull=False
+            ).exclude(blocked_by=[]).only('id', 'user', 'title', 'blocked_by')[:2])  # Max 2
+
+        if not ready_tasks:
+            return warnings
 
-        for task in ready_tasks[:2]:  # Max 2
-            if not task.is_blocked():
+        # One query for all candidates instead of is_blocked() per task
+        if self._open_blocker_keys is not None:
+            open_blocker_keys = self._open_blocker_keys
+        else:
+            open_blocker_keys = Todo.open_blocker_keys(ready_tasks)
+
+        for task in ready_tasks:
+            if not task.is_blocked(open_blocker_keys):
                 warnings.append({
                     'type': 'unblocked',
                     'task_id': task.id,
@@ -387,22 +627,22 @@ class DailyPulseGenerator:
 
         return warnings
 
-    def _check_today_events(self) -> List[Dict]:
+    def _check_today_events(self, upcoming_tasks: List[Todo]) -> List[Dict]:
         """Check important events scheduled for today"""
         warnings = []
 
-        # Get high priority tasks today
-        important_today = Todo.objects.filter(
-            user=self.user,
-            scheduled_date=self.today,
-            priority=3,
-            status__in=['ready', 'pending']
+        # High priority tasks today
+        important_count = sum(
+            1 for task in upcoming_tasks
+            if task.scheduled_date == self.today
+            and task.priority == 3
+            and task.status in ('ready', 'pending')
         )
 
-        if important_today.count() > 3:
+        if important_count > 3:
             warnings.append({
                 'type': 'high_workload',
-                'message': f"У тебя {important_today.count()} важных задач сегодня",
+                'message': f"У тебя {important_count} важных задач сегодня",
                 'severity': 'medium'
             })
 
@@ -412,16 +652,21 @@ class DailyPulseGenerator:
     # Block 5: 💡 Smart Suggestions
     # ==========================================
 
-    def _generate_smart_suggestions(self) -> List[Dict]:
+    def _generate_smart_suggestions(
+        self,
+        recent_tasks: List[Todo],
+        today_tasks: List[Todo],
+        workload: Dict
+    ) -> List[Dict]:
         """Generate smart suggestions"""
         suggestions = []
 
         # Category balance check
-        balance_suggestions = self._check_category_balance()
+        balance_suggestions = self._check_category_balance(recent_tasks)
         suggestions.extend(balance_suggestions)
 
         # Workload optimization
-        workload_suggestions = self._check_workload_optimization()
+        workload_suggestions = self._check_workload_optimization(workload)
         suggestions.extend(workload_suggestions)
 
         # Time pattern recommendations
@@ -429,34 +674,26 @@ class DailyPulseGenerator:
         suggestions.extend(time_suggestions)
 
         # Quick wins
-        quick_win_suggestions = self._find_quick_wins()
+        quick_win_suggestions = self._find_quick_wins(today_tasks)
         suggestions.extend(quick_win_suggestions)
 
         return suggestions[:4]  # Max 4 suggestions
 
-    def _check_category_balance(self) -> List[Dict]:
+    def _check_category_balance(self, recent_tasks: List[Todo]) -> List[Dict]:
         """Check if user is ignoring certain categories"""
         suggestions = []
 
-        # Check last 3 days of tasks
-        three_days_ago = self.today - timedelta(days=3)
-
-        # Get all active goal categories
-        active_goals = GoalSpec.objects.filter(
-            user=self.user,
-            is_active=True
-        ).values_list('category', flat=True)
+        if not self.active_goals:
+            return suggestions
 
-        for category in active_goals:
-            # Check if category has been worked on
-            recent_tasks = Todo.objects.filter(
-                user=self.user,
-                goalspec__category=category,
-                scheduled_date__gte=three_days_ago,
-                scheduled_date__lte=self.today
-            )
+        # Categories worked on in the last 3 days
+        worked_categories = {
+            task.goalspec.category for task in recent_tasks if task.goalspec is not None
+        }
 
-            if not recent_tasks.exists():
+        # Check every active goal category
+        for category in (goal.category for goal in self.active_goals):
+            if category not in worked_categories:
                 category_name = self._translate_category(category)
 
                 # Suggest adding task
@@ -473,12 +710,10 @@ class DailyPulseGenerator:
 
         return suggestions
 
-    def _check_workload_optimization(self) -> List[Dict]:
+    def _check_workload_optimization(self, workload: Dict) -> List[Dict]:
         """Suggest workload optimization"""
         suggestions = []
 
-        workload = self._calculate_workload()
-
         if workload['percentage'] > 80:
             # Too many tasks
             suggestions.append({
@@ -505,12 +740,19 @@ class DailyPulseGenerator:
         """Use behavior patterns to suggest better timing"""
         suggestions = []
 
+        # Skip the lookup for users behavior analysis never found patterns for
+        if not self.has_behavior_patterns:
+            return suggestions
+
         # Get recent failure_time patterns
-        time_patterns = UserBehaviorPattern.objects.filter(
-            user=self.user,
-            pattern_type='failure_time',
-            is_active=True
-        ).order_by('-confidence_score').first()
+        if self._failure_patterns is not None:
+            time_patterns = self._failure_patterns[0] if self._failure_patterns else None
+        else:
+            time_patterns = UserBehaviorPattern.objects.filter(
+                user=self.user,
+                pattern_type='failure_time',
+                is_active=True
+            ).order_by('-confidence_score').first()
 
         if time_patterns:
             problematic_slot = time_patterns.data.get('time_slot')
@@ -533,26 +775,24 @@ class DailyPulseGenerator:
 
         return suggestions
 
-    def _find_quick_wins(self) -> List[Dict]:
+    def _find_quick_wins(self, today_tasks: List[Todo]) -> List[Dict]:
         """Find quick win tasks for momentum"""
         suggestions = []
 
-        # Get quick win tasks (< 20 min, priority 1-2)
-        quick_wins = Todo.objects.filter(
-            user=self.user,
-            scheduled_date=self.today,
-            timebox_minutes__lte=20,
-            priority__in=[1, 2],
-            status__in=['ready', 'pending']
-        )
+        # Get quick win task ids (< 20 min, priority 1-2)
+        quick_win_ids = [
+            task.id for task in today_tasks
+            if task.timebox_minutes <= 20
+            and task.priority in (1, 2)
+            and task.status in ('ready', 'pending')
+        ]
 
-        count = quick_wins.count()
+        count = len(quick_win_ids)
         if count >= 2:
-            task_ids = list(quick_wins.values_list('id', flat=True)[:3])
             suggestions.append({
                 'type': 'quick_win',
                 'message': f"У тебя есть {count} quick win задач (до 20 мин) — отлично для старта дня!",
-                'task_ids': task_ids
+                'task_ids': quick_win_ids[:3]
             })
 
         return suggestions
@@ -561,24 +801,15 @@ class DailyPulseGenerator:
     # Block 6: 📈 Weekly Progress
     # ==========================================
 
-    def _calculate_weekly_progress(self) -> Dict:
+    def _calculate_weekly_progress(self, week_tasks: List[Todo]) -> Dict:
         """Calculate weekly progress summary"""
-        week_start = self.today - timedelta(days=self.today.weekday())
-
-        # Get tasks for this week
-        week_tasks = Todo.objects.filter(
-            user=self.user,
-            scheduled_date__gte=week_start,
-            scheduled_date__lte=self.today
+        total = len(week_tasks)
+        completed = sum(1 for task in week_tasks if task.status == 'done')
+        overdue = sum(
+            1 for task in week_tasks
+            if task.status in ('pending', 'ready') and task.scheduled_date < self.today
         )
 
-        total = week_tasks.count()
-        completed = week_tasks.filter(status='done').count()
-        overdue = week_tasks.filter(
-            status__in=['pending', 'ready'],
-            scheduled_date__lt=self.today
-        ).count()
-
         completion_rate = int((completed / total * 100)) if total > 0 else 0
 
         # Get streak
@@ -606,74 +837,61 @@ class DailyPulseGenerator:
         weekly_progress: Dict
     ) -> str:
         """Format complete daily brief message"""
-        lines = []
+        buf = io.StringIO()
+        write = buf.write
 
         # Block 1: Greeting
-        lines.append(greeting)
-        lines.append("")
+        write(f"{greeting}\n\n")
 
         # Block 2: Priorities
         if priorities:
             count = len(priorities)
-            lines.append(f"🎯 Сегодня у тебя {count} приоритет{'а' if count == 2 else 'ов' if count > 2 else ''}:")
+            write(f"🎯 Сегодня у тебя {count} приоритет{'а' if count == 2 else 'ов' if count > 2 else ''}:\n")
             for p in priorities:
-                line = f"• {p['title']}"
+                write(f"• {p['title']}")
                 if 'deadline' in p:
                     days = p.get('days_until_deadline', 0)
                     if days == 0:
-                        line += " (deadline сегодня)"
+                        write(" (deadline сегодня)")
                     elif days == 1:
-                        line += " (deadline завтра)"
+                        write(" (deadline завтра)")
                     else:
-                        line += f" (deadline через {days} дня)"
-                lines.append(line)
-            lines.append("")
+                        write(f" (deadline через {days} дня)")
+                write("\n")
+            write("\n")
 
         # Block 3: Workload
-        status_text = {
-            'light': 'лёгкий день',
-            'optimal': 'оптимально',
-            'heavy': 'насыщенный день',
-            'overloaded': 'перегрузка'
-        }
-        emoji = {
-            'light': '😌',
-            'optimal': '⚡',
-            'heavy': '💪',
-            'overloaded': '⚠️'
-        }
-        lines.append(f"{emoji.get(workload['status'], '📊')} Общая загрузка — {workload['percentage']}% ({status_text.get(workload['status'], 'нормально')})")
+        write(f"{_WORKLOAD_EMOJI.get(workload['status'], '📊')} Общая загрузка — {workload['percentage']}% ({_WORKLOAD_STATUS_TEXT.get(workload['status'], 'нормально')})\n")
         hours = workload['total_minutes'] // 60
         minutes = workload['total_minutes'] % 60
-        lines.append(f"   Запланировано: {hours} ч {minutes} мин")
-        lines.append("")
+        write(f"   Запланировано: {hours} ч {minutes} мин\n\n")
 
         # Block 4: Warnings
         if warnings:
-            lines.append("⚠️ Напоминания:")
+            write("⚠️ Напоминания:\n")
             for w in warnings[:3]:  # Max 3
-                lines.append(f"• {w['message']}")
-            lines.append("")
+                write(f"• {w['message']}\n")
+            write("\n")
 
         # Block 5: Suggestions
         if suggestions:
-            lines.append("💡 Smart suggestions:")
+            write("💡 Smart suggestions:\n")
             for s in suggestions[:3]:  # Max 3
-                lines.append(f"• {s['message']}")
-            lines.append("")
+                write(f"• {s['message']}\n")
+            write("\n")
 
         # Block 6: Weekly Progress
-        lines.append("📈 Прогресс недели:")
-        lines.append(f"   {weekly_progress['completion_rate']}% выполнено ({weekly_progress['completed_tasks']}/{weekly_progress['total_tasks']} задач)")
+        write("📈 Прогресс недели:\n")
+        write(f"   {weekly_progress['completion_rate']}% выполнено ({weekly_progress['completed_tasks']}/{weekly_progress['total_tasks']} задач)\n")
         if weekly_progress['overdue_tasks'] > 0:
-            lines.append(f"   {weekly_progress['overdue_tasks']} просрочено")
+            write(f"   {weekly_progress['overdue_tasks']} просрочено\n")
         if weekly_progress['streak_days'] >= 3:
-            lines.append(f"   🔥 Streak: {weekly_progress['streak_days']} дней!")
-        lines.append("")
+            write(f"   🔥 Streak: {weekly_progress['streak_days']} дней!\n")
+        write("\n")
 
-        lines.append("Готов начать день? 🚀")
+        write("Готов начать день? 🚀")
 
-        return "\n".join(lines)
+        return buf.getvalue()
 
     # ==========================================
     # Helper Methods
@@ -681,24 +899,8 @@ class DailyPulseGenerator:
 
     def _translate_category(self, category: str) -> str:
         """Translate category to Russian"""
-        translations = {
-            'study': 'учёба',
-            'career': 'карьера',
-            'sport': 'спорт',
-            'health': 'здоровье',
-            'finance': 'финансы',
-            'creative': 'творчество',
-            'admin': 'админ',
-            'other': 'другое'
-        }
-        return translations.get(category, category)
+        return _CATEGORY_RU.get(category, category)
 
     def _suggest_better_time(self, problematic_slot: str) -> str:
         """Suggest better time based on problematic slot"""
-        suggestions = {
-            'evening': 'утром (9-11 am)',
-            'night': 'днём (2-4 pm)',
-            'morning': 'днём (12-2 pm)',
-            'afternoon': 'утром (8-10 am)'
-        }
-        return suggestions.get(problematic_slot, 'другое время')
+        return _BETTER_TIME.get(problematic_slot, 'другое время')
@@ -3,20 +3,101 @@ Analytics Services for PathAI
 - BehaviorAnalyzer: Analyzes user behavior patterns
 - ReflectionGenerator: Generates weekly reflections
 """
-import json
+import hashlib
+import heapq
+import logging
+import re
+import orjson
 from datetime import datetime, timedelta
+from operator import itemgetter
 from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
 from django.utils import timezone
-from django.db.models import Count, Q, Avg, F
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.db.models.functions import ExtractHour
 from collections import defaultdict, Counter
 
 from .models import UserBehaviorPattern, WeeklyReflection
 from todos.models import Todo
 from todos.advanced_models import TaskCompletion
 from chat.models import ChatMessage
-from users.models import User, GoalSpec
+from users.models import User, GoalSpec, UserProfile
 from ai.services import AIService
 
+logger = logging.getLogger(__name__)
+
+
+def _time_slot(hour: int) -> str:
+    """Time of day a scheduled_time hour falls into"""
+    if 6 <= hour < 12:
+        return 'morning'    # 6am - 12pm
+    if 12 <= hour < 18:
+        return 'afternoon'  # 12pm - 6pm
+    if 18 <= hour < 22:
+        return 'evening'    # 6pm - 10pm
+    return 'night'          # 10pm - 6am
+
+
+# Lookup tables for reflection insights and action items
+_PATTERN_ICONS = {
+    'failure_time': '🔴',
+    'failure_category': '📉',
+    'procrastination': '⏳',
+    'chat_topics': '💬'
+}
+
+_TIME_SLOT_RU = {
+    'morning': 'утро',
+    'afternoon': 'день',
+    'evening': 'вечер',
+    'night': 'ночь'
+}
+
+_CATEGORY_RU = {
+    'study': 'учёба',
+    'career': 'карьера',
+    'sport': 'спорт',
+    'health': 'здоровье',
+    'finance': 'финансы',
+    'creative': 'творчество',
+    'admin': 'админ',
+    'other': 'другое'
+}
+
+_SENTIMENT_RU = {
+    'anxious': 'тревожно',
+    'excited': 'с энтузиазмом',
+    'frustrated': 'с фрустрацией',
+    'neutral': 'нейтрально'
+}
+
+_BETTER_TIME = {
+    'evening': 'утро (9-11 am)',
+    'night': 'день (2-4 pm)',
+    'morning': 'день (12-2 pm)',
+    'afternoon': 'утро (8-10 am)'
+}
+
+# Words too common to count as a chat topic in the keyword fallback
+_CHAT_STOPWORDS = frozenset({
+    'этот', 'этом', 'если', 'чтобы', 'когда', 'можно', 'нужно', 'надо',
+    'очень', 'меня', 'тебя', 'есть', 'было', 'будет', 'буду', 'какие',
+    'какой', 'сейчас', 'тоже', 'только', 'просто', 'хочу', 'могу',
+    'через', 'после', 'потом', 'сделать', 'спасибо', 'пожалуйста',
+    'помоги', 'привет',
+    'that', 'this', 'with', 'have', 'what', 'when', 'your', 'about',
+    'from', 'want', 'need', 'just', 'like', 'please', 'thanks', 'help',
+})
+# Runs of 4+ letters; digits and underscores split words, so ids and
+# numbers never count as topics
+_WORD_RE = re.compile(r'[^\W\d_]{4,}')
+
+# Chat-topic analysis (an LLM call) runs here so it overlaps the DB-bound
+# analyses of the same run
+_ANALYSIS_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='behavior-analysis')
+
 
 class BehaviorAnalyzer:
     """
@@ -46,131 +127,148 @@ class BehaviorAnalyzer:
         """
         patterns = []
 
+        # 4. Chat topics wait on an LLM round-trip, so start them on a worker
+        # thread and run the DB-only analyses here in the meantime
+        chat_future = _ANALYSIS_EXECUTOR.submit(self._analyze_chat_topics_in_thread, start_date, end_date)
+
+        # The DB analyses all read the same week of tasks, so load it once
+        todos = self._window_todos(start_date, end_date)
+
         # 1. Analyze failure patterns by time
-        time_patterns = self.analyze_failure_by_time(start_date, end_date)
+        time_patterns = self.analyze_failure_by_time(start_date, end_date, todos)
         patterns.extend(time_patterns)
 
         # 2. Analyze failure patterns by category
-        category_patterns = self.analyze_failure_by_category(start_date, end_date)
+        category_patterns = self.analyze_failure_by_category(start_date, end_date, todos)
         patterns.extend(category_patterns)
 
         # 3. Analyze procrastination patterns
-        procrastination_patterns = self.analyze_procrastination(start_date, end_date)
+        procrastination_patterns = self.analyze_procrastination(start_date, end_date, todos)
         patterns.extend(procrastination_patterns)
 
         # 4. Analyze chat topics
-        chat_patterns = self.analyze_chat_topics(start_date, end_date)
+        chat_patterns = chat_future.result()
         patterns.extend(chat_patterns)
 
+        # Let the daily pulse know there are patterns to look up
+        if patterns:
+            UserProfile.objects.filter(
+                user=self.user,
+                has_behavior_patterns=False
+            ).update(has_behavior_patterns=True)
+
         return patterns
 
-    def analyze_failure_by_time(self, start_date: datetime.date, end_date: datetime.date) -> List[UserBehaviorPattern]:
+    def _analyze_chat_topics_in_thread(self, start_date: datetime.date, end_date: datetime.date) -> List[UserBehaviorPattern]:
+        """Run analyze_chat_topics on a pool thread, closing its DB connection after"""
+        try:
+            return self.analyze_chat_topics(start_date, end_date)
+        finally:
+            connection.close()
+
+    def _window_todos(self, start_date: datetime.date, end_date: datetime.date) -> List[Dict[str, Any]]:
+        """
+        Tasks scheduled in the window as plain rows with just the fields the
+        analyses read (no model instances are built)
+        """
+        return list(Todo.objects.filter(
+            user=self.user,
+            scheduled_date__range=[start_date, end_date]
+        ).values(
+            'id', 'title', 'status', 'created_at', 'goalspec_id',
+            goal_category=F('goalspec__category'),
+            hour=ExtractHour('scheduled_time')
+        ))
+
+    def analyze_failure_by_time(
+        self,
+        start_date: datetime.date,
+        end_date: datetime.date,
+        todos: Optional[List[Dict[str, Any]]] = None
+    ) -> List[UserBehaviorPattern]:
         """
         Analyze when user fails/skips tasks (morning/afternoon/evening/night)
+
+        todos: the window's tasks (from _window_todos), loaded here if not given
         """
         patterns = []
 
-        # Get all failed/skipped tasks in time window
-        failed_tasks = Todo.objects.filter(
-            user=self.user,
-            scheduled_date__range=[start_date, end_date],
-            status__in=['skipped']
-        ).exclude(scheduled_time__isnull=True)
+        if todos is None:
+            todos = self._window_todos(start_date, end_date)
+
+        # All failed/skipped tasks that had a time
+        failed_tasks = [
+            task for task in todos
+            if task['status'] == 'skipped' and task['hour'] is not None
+        ]
+        total_failed = len(failed_tasks)
 
-        if failed_tasks.count() < 3:
+        if total_failed < 3:
             # Not enough data
             return patterns
 
         # Group by time of day
-        time_slots = {
-            'morning': [],    # 6am - 12pm
-            'afternoon': [],  # 12pm - 6pm
-            'evening': [],    # 6pm - 10pm
-            'night': []       # 10pm - 6am
-        }
-
+        time_slots = {'morning': [], 'afternoon': [], 'evening': [], 'night': []}
         for task in failed_tasks:
-            hour = task.scheduled_time.hour
-            if 6 <= hour < 12:
-                time_slots['morning'].append(task)
-            elif 12 <= hour < 18:
-                time_slots['afternoon'].append(task)
-            elif 18 <= hour < 22:
-                time_slots['evening'].append(task)
-            else:
-                time_slots['night'].append(task)
+            time_slots[_time_slot(task['hour'])].append(task)
 
         # Find the most problematic time slot
-        total_failed = failed_tasks.count()
         for slot_name, tasks in time_slots.items():
             if len(tasks) >= 3:  # Minimum threshold
                 failure_rate = len(tasks) / total_failed
 
                 if failure_rate >= 0.4:  # 40% or more failures in this slot
-                    # Extract task categories
-                    categories = []
+                    category_counts = {}
                     for task in tasks:
-                        if task.goalspec:
-                            categories.append(task.goalspec.category)
-
-                    pattern, created = UserBehaviorPattern.objects.get_or_create(
-                        user=self.user,
-                        pattern_type='failure_time',
-                        time_window_start=start_date,
-                        defaults={
-                            'time_window_end': end_date,
-                            'data': {
-                                'time_slot': slot_name,
-                                'failure_rate': round(failure_rate, 2),
-                                'tasks_affected': len(tasks),
-                                'task_ids': [t.id for t in tasks[:5]],
-                                'common_categories': Counter(categories).most_common(2) if categories else []
-                            },
-                            'confidence_score': min(0.9, failure_rate + 0.2),
-                            'is_active': True
-                        }
-                    )
-                    if not created:
-                        # Update existing pattern
-                        pattern.data = {
+                        if task['goalspec_id']:
+                            category = task['goal_category']
+                            category_counts[category] = category_counts.get(category, 0) + 1
+
+                    patterns.append(self._new_pattern(
+                        'failure_time', start_date, end_date,
+                        data={
                             'time_slot': slot_name,
                             'failure_rate': round(failure_rate, 2),
                             'tasks_affected': len(tasks),
-                            'task_ids': [t.id for t in tasks[:5]],
-                            'common_categories': Counter(categories).most_common(2) if categories else []
-                        }
-                        pattern.confidence_score = min(0.9, failure_rate + 0.2)
-                        pattern.save()
-                    patterns.append(pattern)
+                            'task_ids': [task['id'] for task in tasks[:5]],
+                            'common_categories': heapq.nlargest(2, category_counts.items(), key=itemgetter(1))
+                        },
+                        confidence_score=min(0.9, failure_rate + 0.2)
+                    ))
 
-        return patterns
+        return self._save_patterns(patterns)
 
-    def analyze_failure_by_category(self, start_date: datetime.date, end_date: datetime.date) -> List[UserBehaviorPattern]:
+    def analyze_failure_by_category(
+        self,
+        start_date: datetime.date,
+        end_date: datetime.date,
+        todos: Optional[List[Dict[str, Any]]] = None
+    ) -> List[UserBehaviorPattern]:
         """
         Analyze which goal categories user fails most
+
+        todos: the window's tasks (from _window_todos), loaded here if not given
         """
         patterns = []
 
-        # Get all tasks with categories
-        all_tasks = Todo.objects.filter(
-            user=self.user,
-            scheduled_date__range=[start_date, end_date],
-            goalspec__isnull=False
-        )
+        if todos is None:
+            todos = self._window_todos(start_date, end_date)
 
-        if all_tasks.count() < 5:
+        # All tasks with categories
+        goal_tasks = [task for task in todos if task['goalspec_id']]
+
+        if len(goal_tasks) < 5:
             return patterns
 
         # Group by category
         category_stats = defaultdict(lambda: {'total': 0, 'skipped': 0, 'task_ids': []})
+        for task in goal_tasks:
+            stats = category_stats[task['goal_category']]
+            stats['total'] += 1
 
-        for task in all_tasks:
-            category = task.goalspec.category
-            category_stats[category]['total'] += 1
-
-            if task.status == 'skipped':
-                category_stats[category]['skipped'] += 1
-                category_stats[category]['task_ids'].append(task.id)
+            if task['status'] == 'skipped':
+                stats['skipped'] += 1
+                stats['task_ids'].append(task['id'])
 
         # Find categories with high failure rate
         for category, stats in category_stats.items():
@@ -178,101 +276,76 @@ class BehaviorAnalyzer:
                 failure_rate = stats['skipped'] / stats['total']
 
                 if failure_rate >= 0.5:  # 50% or more failures
-                    pattern, created = UserBehaviorPattern.objects.get_or_create(
-                        user=self.user,
-                        pattern_type='failure_category',
-                        time_window_start=start_date,
-                        defaults={
-                            'time_window_end': end_date,
-                            'data': {
-                                'category': category,
-                                'failure_rate': round(failure_rate, 2),
-                                'total_tasks': stats['total'],
-                                'skipped_tasks': stats['skipped'],
-                                'task_ids': stats['task_ids'][:5]
-                            },
-                            'confidence_score': min(0.9, failure_rate + 0.1),
-                            'is_active': True
-                        }
-                    )
-                    if not created:
-                        pattern.data = {
+                    patterns.append(self._new_pattern(
+                        'failure_category', start_date, end_date,
+                        data={
                             'category': category,
                             'failure_rate': round(failure_rate, 2),
                             'total_tasks': stats['total'],
                             'skipped_tasks': stats['skipped'],
                             'task_ids': stats['task_ids'][:5]
-                        }
-                        pattern.confidence_score = min(0.9, failure_rate + 0.1)
-                        pattern.save()
-                    patterns.append(pattern)
+                        },
+                        confidence_score=min(0.9, failure_rate + 0.1)
+                    ))
 
-        return patterns
+        return self._save_patterns(patterns)
 
-    def analyze_procrastination(self, start_date: datetime.date, end_date: datetime.date) -> List[UserBehaviorPattern]:
+    def analyze_procrastination(
+        self,
+        start_date: datetime.date,
+        end_date: datetime.date,
+        todos: Optional[List[Dict[str, Any]]] = None
+    ) -> List[UserBehaviorPattern]:
         """
         Analyze which tasks get delayed (pending > 3 days)
+
+        todos: the window's tasks (from _window_todos), loaded here if not given
         """
         patterns = []
 
-        # Get tasks that were rescheduled or stayed pending for long
-        delayed_tasks = Todo.objects.filter(
-            user=self.user,
-            created_at__date__lte=end_date - timedelta(days=3),
-            scheduled_date__range=[start_date, end_date],
-            status='pending'
-        ).select_related('goalspec')
+        if todos is None:
+            todos = self._window_todos(start_date, end_date)
+
+        today = timezone.now().date()
+        created_before = end_date - timedelta(days=3)
 
-        if delayed_tasks.count() < 3:
+        # Tasks that stayed pending for long
+        delayed_tasks = [
+            task for task in todos
+            if task['status'] == 'pending' and timezone.localdate(task['created_at']) <= created_before
+        ]
+
+        if len(delayed_tasks) < 3:
             return patterns
 
         # Group by category
-        category_delays = defaultdict(lambda: {'tasks': [], 'avg_delay': 0})
-
+        category_delays = defaultdict(list)
         for task in delayed_tasks:
-            if task.goalspec:
-                category = task.goalspec.category
-                delay_days = (timezone.now().date() - task.created_at.date()).days
-                category_delays[category]['tasks'].append({
-                    'id': task.id,
-                    'title': task.title,
-                    'delay_days': delay_days
+            if task['goalspec_id']:
+                category_delays[task['goal_category']].append({
+                    'id': task['id'],
+                    'title': task['title'],
+                    'delay_days': (today - task['created_at'].date()).days
                 })
 
-        # Calculate average delay per category
-        for category, data in category_delays.items():
-            if len(data['tasks']) >= 2:
-                avg_delay = sum(t['delay_days'] for t in data['tasks']) / len(data['tasks'])
-
-                if avg_delay >= 3:  # Average delay of 3+ days
-                    pattern, created = UserBehaviorPattern.objects.get_or_create(
-                        user=self.user,
-                        pattern_type='procrastination',
-                        time_window_start=start_date,
-                        defaults={
-                            'time_window_end': end_date,
-                            'data': {
-                                'category': category,
-                                'avg_delay_days': round(avg_delay, 1),
-                                'tasks_count': len(data['tasks']),
-                                'task_examples': data['tasks'][:3]
-                            },
-                            'confidence_score': min(0.85, avg_delay / 10),
-                            'is_active': True
-                        }
-                    )
-                    if not created:
-                        pattern.data = {
+        # Categories with 2+ tasks and an average delay of 3+ days
+        for category, tasks in category_delays.items():
+            if len(tasks) >= 2:
+                avg_delay = sum(t['delay_days'] for t in tasks) / len(tasks)
+
+                if avg_delay >= 3:
+                    patterns.append(self._new_pattern(
+                        'procrastination', start_date, end_date,
+                        data={
                             'category': category,
                             'avg_delay_days': round(avg_delay, 1),
-                            'tasks_count': len(data['tasks']),
-                            'task_examples': data['tasks'][:3]
-                        }
-                        pattern.confidence_score = min(0.85, avg_delay / 10)
-                        pattern.save()
-                    patterns.append(pattern)
+                            'tasks_count': len(tasks),
+                            'task_examples': tasks[:3]
+                        },
+                        confidence_score=min(0.85, avg_delay / 10)
+                    ))
 
-        return patterns
+        return self._save_patterns(patterns)
 
     def analyze_chat_topics(self, start_date: datetime.date, end_date: datetime.date) -> List[UserBehaviorPattern]:
         """
@@ -280,20 +353,20 @@ class BehaviorAnalyzer:
         """
         patterns = []
 
-        # Get user's chat messages from the week
-        messages = ChatMessage.objects.filter(
+        # Get user's chat messages from the week (only the text, capped at
+        # the 50 the prompt uses)
+        message_texts = list(ChatMessage.objects.filter(
             user=self.user,
             role='user',
             created_at__date__range=[start_date, end_date]
-        ).order_by('created_at')
+        ).order_by('created_at').values_list('content', flat=True)[:50])
 
-        if messages.count() < 5:
+        if len(message_texts) < 5:
             # Not enough chat data
             return patterns
 
         # Combine messages into chunks for AI analysis
-        message_texts = [msg.content for msg in messages]
-        combined_text = "\n---\n".join(message_texts[:50])  # Limit to 50 messages
+        combined_text = "\n---\n".join(message_texts)
 
         # Use AI to extract topics
         try:
@@ -329,56 +402,195 @@ Return only the JSON response."""
                 response_format='text'
             )
 
-            # Parse AI response
-            # Remove markdown code block if present
-            response = response.strip()
-            if response.startswith('```json'):
-                response = response[7:]
-            if response.startswith('```'):
-                response = response[3:]
-            if response.endswith('```'):
-                response = response[:-3]
-            response = response.strip()
+            # Parse AI response: take the outermost JSON object, which also
+            # drops a surrounding markdown code block if present
+            start = response.find('{')
+            end = response.rfind('}')
+            if 0 <= start < end:
+                response = response[start:end + 1]
 
-            analysis = json.loads(response)
+            analysis = orjson.loads(response)
 
             # Create patterns for each topic
             for topic_data in analysis.get('topics', [])[:3]:
                 if topic_data.get('frequency', 0) >= 3:
-                    pattern, created = UserBehaviorPattern.objects.get_or_create(
-                        user=self.user,
-                        pattern_type='chat_topics',
-                        time_window_start=start_date,
-                        defaults={
-                            'time_window_end': end_date,
-                            'data': {
-                                'topic': topic_data.get('topic', 'Unknown'),
-                                'frequency': topic_data.get('frequency', 0),
-                                'sentiment': topic_data.get('sentiment', 'neutral'),
-                                'keywords': topic_data.get('keywords', [])
-                            },
-                            'confidence_score': 0.7,
-                            'is_active': True
-                        }
-                    )
-                    if not created:
-                        pattern.data = {
+                    patterns.append(self._new_pattern(
+                        'chat_topics', start_date, end_date,
+                        data={
                             'topic': topic_data.get('topic', 'Unknown'),
                             'frequency': topic_data.get('frequency', 0),
                             'sentiment': topic_data.get('sentiment', 'neutral'),
                             'keywords': topic_data.get('keywords', [])
-                        }
-                        pattern.save()
-                    patterns.append(pattern)
+                        },
+                        confidence_score=0.7
+                    ))
 
-        except Exception as e:
-            print(f"Error analyzing chat topics: {e}")
+        except Exception:
+            logger.exception("Error analyzing chat topics")
             # Fallback: simple keyword counting
-            pass
+            patterns = self._keyword_chat_topics(message_texts, start_date, end_date)
+
+        return self._save_patterns(patterns)
+
+    def _keyword_chat_topics(
+        self,
+        message_texts: List[str],
+        start_date: datetime.date,
+        end_date: datetime.date
+    ) -> List[UserBehaviorPattern]:
+        """
+        Pick the top 3 keywords across the messages when AI topic extraction
+        fails. Frequency is the number of messages mentioning the word.
+        """
+        keyword_counts = Counter()
+        for text in message_texts:
+            keyword_counts.update({
+                word for word in _WORD_RE.findall(text.lower())
+                if word not in _CHAT_STOPWORDS
+            })
+
+        return [
+            self._new_pattern(
+                'chat_topics', start_date, end_date,
+                data={
+                    'topic': keyword,
+                    'frequency': freq,
+                    'sentiment': 'neutral',
+                    'keywords': [keyword]
+                },
+                confidence_score=0.5
+            )
+            for keyword, freq in keyword_counts.most_common(3)
+            if freq >= 3
+        ]
+
+    def _new_pattern(
+        self,
+        pattern_type: str,
+        start_date: datetime.date,
+        end_date: datetime.date,
+        data: Dict[str, Any],
+        confidence_score: float
+    ) -> UserBehaviorPattern:
+        """Unsaved active pattern for this user's window, stored by _save_patterns"""
+        return UserBehaviorPattern(
+            user=self.user,
+            pattern_type=pattern_type,
+            time_window_start=start_date,
+            time_window_end=end_date,
+            data=data,
+            confidence_score=confidence_score,
+            is_active=True
+        )
+
+    def _save_patterns(self, patterns: List[UserBehaviorPattern]) -> List[UserBehaviorPattern]:
+        """
+        Upsert detected patterns in one query
+
+        Patterns share the (user, pattern_type, time_window_start) row, so when
+        one analysis yields several, the last one is stored, as the old
+        get_or_create + save sequence did. All of them are returned.
+        """
+        latest = {}
+        for pattern in patterns:
+            latest[(pattern.pattern_type, pattern.time_window_start)] = pattern
+
+        if latest:
+            UserBehaviorPattern.objects.bulk_create(
+                list(latest.values()),
+                update_conflicts=True,
+                unique_fields=['user', 'pattern_type', 'time_window_start'],
+                update_fields=['time_window_end', 'data', 'confidence_score', 'is_active', 'last_updated']
+            )
 
         return patterns
 
 
+def _failure_time_message(data: Dict[str, Any]) -> str:
+    time_slot = data.get('time_slot', 'unknown')
+    count = data.get('tasks_affected', 0)
+    categories = data.get('common_categories', [])
+
+    message = f"Ты откладывал задачи {count} раз — все были запланированы на {_TIME_SLOT_RU.get(time_slot, time_slot)}"
+    if categories:
+        top_category = categories[0][0]
+        message += f" (чаще всего {_CATEGORY_RU.get(top_category, top_category)})"
+
+    return message
+
+
+def _failure_category_message(data: Dict[str, Any]) -> str:
+    category = data.get('category', 'unknown')
+    rate = int(data.get('failure_rate', 0) * 100)
+    count = data.get('skipped_tasks', 0)
+
+    return f"Ты пропустил {count} {_CATEGORY_RU.get(category, category)} задач ({rate}%)"
+
+
+def _procrastination_message(data: Dict[str, Any]) -> str:
+    category = data.get('category', 'unknown')
+    avg_delay = data.get('avg_delay_days', 0)
+    count = data.get('tasks_count', 0)
+
+    return f"Задачи по {_CATEGORY_RU.get(category, category)} откладываются в среднем на {avg_delay} дней ({count} задач)"
+
+
+def _chat_topics_message(data: Dict[str, Any]) -> str:
+    topic = data.get('topic', 'unknown')
+    freq = data.get('frequency', 0)
+    sentiment = data.get('sentiment', 'neutral')
+
+    message = f"Чаще всего обсуждал: {topic} ({freq} раз)"
+    if sentiment != 'neutral':
+        message += f" — {_SENTIMENT_RU.get(sentiment, sentiment)}"
+
+    return message
+
+
+def _failure_time_action(data: Dict[str, Any]) -> Dict[str, Any]:
+    # Suggest rescheduling to better time
+    time_slot = data.get('time_slot', '')
+    return {
+        'action': 'reschedule_tasks',
+        'description': f"Перенести задачи на {_BETTER_TIME.get(time_slot, 'другое время')}",
+        'task_ids': data.get('task_ids', []),
+        'impact': 'high'
+    }
+
+
+def _failure_category_action(data: Dict[str, Any]) -> Dict[str, Any]:
+    category = data.get('category', '')
+    return {
+        'action': 'review_category',
+        'description': f"Пересмотреть приоритеты для {_CATEGORY_RU.get(category, category)}",
+        'category': category,
+        'impact': 'medium'
+    }
+
+
+def _chat_topics_action(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'action': 'create_recurring',
+        'description': f"Добавить recurring задачу: {data.get('topic', '')}",
+        'impact': 'medium'
+    }
+
+
+# Pattern type -> builder for the insight message / action item
+_INSIGHT_MESSAGE_BUILDERS = {
+    'failure_time': _failure_time_message,
+    'failure_category': _failure_category_message,
+    'procrastination': _procrastination_message,
+    'chat_topics': _chat_topics_message
+}
+
+_ACTION_ITEM_BUILDERS = {
+    'failure_time': _failure_time_action,
+    'failure_category': _failure_category_action,
+    'chat_topics': _chat_topics_action
+}
+
+
 class ReflectionGenerator:
     """
     Generates weekly reflections based on behavior patterns
@@ -409,10 +621,14 @@ class ReflectionGenerator:
         Returns:
             WeeklyReflection instance or None if not enough data
         """
-        # Check if reflection already exists
+        # Check if reflection already exists; callers only read the summary
+        # fields, so the AI-written full_message stays deferred
         existing = WeeklyReflection.objects.filter(
             user=self.user,
             week_start_date=week_start
+        ).only(
+            'id', 'user', 'week_start_date', 'week_end_date',
+            'insights', 'action_items', 'patterns_analyzed'
         ).first()
 
         if existing:
@@ -454,48 +670,19 @@ class ReflectionGenerator:
         insights = []
 
         for pattern in patterns:
+            pattern_type = pattern.pattern_type
+            data = pattern.data
             insight = {
-                'type': pattern.pattern_type,
-                'icon': self._get_icon(pattern.pattern_type),
+                'type': pattern_type,
+                'icon': self._get_icon(pattern_type),
                 'priority': self._calculate_priority(pattern),
-                'evidence': pattern.data
+                'evidence': data
             }
 
             # Generate human-readable message
-            if pattern.pattern_type == 'failure_time':
-                time_slot = pattern.data.get('time_slot', 'unknown')
-                count = pattern.data.get('tasks_affected', 0)
-                categories = pattern.data.get('common_categories', [])
-
-                message = f"Ты откладывал задачи {count} раз — все были запланированы на {self._translate_time_slot(time_slot)}"
-                if categories:
-                    top_category = categories[0][0]
-                    message += f" (чаще всего {self._translate_category(top_category)})"
-
-                insight['message'] = message
-
-            elif pattern.pattern_type == 'failure_category':
-                category = pattern.data.get('category', 'unknown')
-                rate = int(pattern.data.get('failure_rate', 0) * 100)
-                count = pattern.data.get('skipped_tasks', 0)
-
-                insight['message'] = f"Ты пропустил {count} {self._translate_category(category)} задач ({rate}%)"
-
-            elif pattern.pattern_type == 'procrastination':
-                category = pattern.data.get('category', 'unknown')
-                avg_delay = pattern.data.get('avg_delay_days', 0)
-                count = pattern.data.get('tasks_count', 0)
-
-                insight['message'] = f"Задачи по {self._translate_category(category)} откладываются в среднем на {avg_delay} дней ({count} задач)"
-
-            elif pattern.pattern_type == 'chat_topics':
-                topic = pattern.data.get('topic', 'unknown')
-                freq = pattern.data.get('frequency', 0)
-                sentiment = pattern.data.get('sentiment', 'neutral')
-
-                insight['message'] = f"Чаще всего обсуждал: {topic} ({freq} раз)"
-                if sentiment != 'neutral':
-                    insight['message'] += f" — {self._translate_sentiment(sentiment)}"
+            build_message = _INSIGHT_MESSAGE_BUILDERS.get(pattern_type)
+            if build_message:
+                insight['message'] = build_message(data)
 
             insights.append(insight)
 
@@ -509,37 +696,9 @@ class ReflectionGenerator:
         actions = []
 
         for pattern in patterns:
-            if pattern.pattern_type == 'failure_time':
-                time_slot = pattern.data.get('time_slot', '')
-                task_ids = pattern.data.get('task_ids', [])
-
-                # Suggest rescheduling to better time
-                better_time = self._suggest_better_time(time_slot)
-                actions.append({
-                    'action': 'reschedule_tasks',
-                    'description': f"Перенести задачи на {better_time}",
-                    'task_ids': task_ids,
-                    'impact': 'high'
-                })
-
-            elif pattern.pattern_type == 'failure_category':
-                category = pattern.data.get('category', '')
-
-                actions.append({
-                    'action': 'review_category',
-                    'description': f"Пересмотреть приоритеты для {self._translate_category(category)}",
-                    'category': category,
-                    'impact': 'medium'
-                })
-
-            elif pattern.pattern_type == 'chat_topics':
-                topic = pattern.data.get('topic', '')
-
-                actions.append({
-                    'action': 'create_recurring',
-                    'description': f"Добавить recurring задачу: {topic}",
-                    'impact': 'medium'
-                })
+            build_action = _ACTION_ITEM_BUILDERS.get(pattern.pattern_type)
+            if build_action:
+                actions.append(build_action(pattern.data))
 
         return actions
 
@@ -553,18 +712,18 @@ class ReflectionGenerator:
     ) -> str:
         """Generate adaptive reflection message using AI"""
 
-        # Prepare context for AI
-        patterns_summary = json.dumps([
+        # Prepare context for AI (compact JSON keeps the prompt short)
+        patterns_summary = orjson.dumps([
             {
                 'type': p.pattern_type,
                 'data': p.data,
                 'confidence': p.confidence_score
             }
             for p in patterns
-        ], ensure_ascii=False, indent=2)
+        ], default=str).decode()
 
-        insights_summary = json.dumps(insights, ensure_ascii=False, indent=2)
-        actions_summary = json.dumps(action_items, ensure_ascii=False, indent=2)
+        insights_summary = orjson.dumps(insights, default=str).decode()
+        actions_summary = orjson.dumps(action_items, default=str).decode()
 
         # AI prompt
         system_prompt = """Ты — персональный AI-коуч для Path AI, который пишет еженедельные рефлексии пользователю.
@@ -605,12 +764,20 @@ class ReflectionGenerator:
 
 Напиши короткую рефлексию (3-5 абзацев) на русском языке."""
 
+        # The prompt is fully determined by the patterns, insights and week,
+        # so a regeneration for the same input reuses the earlier message
+        cache_key = f"weekly_reflection_msg:{hashlib.md5(user_prompt.encode()).hexdigest()}"
+        cached_message = cache.get(cache_key)
+        if cached_message:
+            return cached_message
+
         try:
             message = self.ai_service._call_anthropic(
                 system_prompt=system_prompt,
                 user_prompt=user_prompt
-            )
-            return message.strip()
+            ).strip()
+            cache.set(cache_key, message, timeout=60 * 60 * 24 * 7)
+            return message
         except Exception as e:
             print(f"Error generating reflection message: {e}")
             # Fallback to simple template
@@ -635,14 +802,9 @@ class ReflectionGenerator:
 
     # Helper methods
 
-    def _get_icon(self, pattern_type: str) -> str:
-        icons = {
-            'failure_time': '🔴',
-            'failure_category': '📉',
-            'procrastination': '⏳',
-            'chat_topics': '💬'
-        }
-        return icons.get(pattern_type, '📊')
+    @staticmethod
+    def _get_icon(pattern_type: str) -> str:
+        return _PATTERN_ICONS.get(pattern_type, '📊')
 
     def _calculate_priority(self, pattern: UserBehaviorPattern) -> int:
         """Calculate priority (1-5) based on confidence and impact"""
@@ -655,43 +817,3 @@ class ReflectionGenerator:
             base_priority += 1
 
         return min(5, base_priority)
-
-    def _translate_time_slot(self, slot: str) -> str:
-        translations = {
-            'morning': 'утро',
-            'afternoon': 'день',
-            'evening': 'вечер',
-            'night': 'ночь'
-        }
-        return translations.get(slot, slot)
-
-    def _translate_category(self, category: str) -> str:
-        translations = {
-            'study': 'учёба',
-            'career': 'карьера',
-            'sport': 'спорт',
-            'health': 'здоровье',
-            'finance': 'финансы',
-            'creative': 'творчество',
-            'admin': 'админ',
-            'other': 'другое'
-        }
-        return translations.get(category, category)
-
-    def _translate_sentiment(self, sentiment: str) -> str:
-        translations = {
-            'anxious': 'тревожно',
-            'excited': 'с энтузиазмом',
-            'frustrated': 'с фрустрацией',
-            'neutral': 'нейтрально'
-        }
-        return translations.get(sentiment, sentiment)
-
-    def _suggest_better_time(self, problematic_slot: str) -> str:
-        suggestions = {
-            'evening': 'утро (9-11 am)',
-            'night': 'день (2-4 pm)',
-            'morning': 'день (12-2 pm)',
-            'afternoon': 'утро (8-10 am)'
-        }
-        return suggestions.get(problematic_slot, 'другое время')
@@ -3,7 +3,7 @@ Celery tasks for analytics app
 - Weekly reflection generation (Sunday evenings)
 - Daily behavior pattern updates
 """
-from celery import shared_task
+from celery import chord, group, shared_task
 from datetime import datetime, timedelta
 from django.utils import timezone
 from django.contrib.auth import get_user_model
@@ -13,57 +13,77 @@ from .models import WeeklyReflection
 
 User = get_user_model()
 
+# Rows per fetch when streaming user ids into a fan-out group
+FANOUT_CHUNK_SIZE = 500
+
 
 @shared_task(name='analytics.generate_weekly_reflections')
 def generate_weekly_reflections():
     """
-    Generate weekly reflections for all active users
+    Queue weekly reflections for all active users
     Runs every Sunday at 7 PM
 
+    Each reflection makes two LLM calls, so every user gets their own
+    generate_reflection_for_user task, run in parallel across the workers;
+    summarize_weekly_reflections collects the outcome once all are done.
+
     Returns:
-        dict: Summary of reflections generated
+        dict: Summary of reflections queued
     """
     today = timezone.now().date()
 
     # Calculate week boundaries (Monday - Sunday)
     week_start = today - timedelta(days=today.weekday())  # This Monday
-    week_end = week_start + timedelta(days=6)  # This Sunday
+    week_start_str = week_start.isoformat()
 
     # Get all active users
-    active_users = User.objects.filter(is_active=True)
+    user_ids = User.objects.filter(is_active=True).values_list('id', flat=True)
 
-    results = {
-        'total_users': active_users.count(),
-        'reflections_created': 0,
-        'reflections_skipped': 0,
-        'errors': []
+    job = group(
+        generate_reflection_for_user.s(user_id, week_start_str, 'scheduled')
+        for user_id in user_ids.iterator(chunk_size=FANOUT_CHUNK_SIZE)
+    )
+    if job.tasks:
+        chord(job)(summarize_weekly_reflections.s(week_start_str))
+
+    return {
+        'week_start': week_start_str,
+        'reflections_queued': len(job.tasks)
     }
 
-    for user in active_users:
-        try:
-            generator = ReflectionGenerator(user)
-            reflection = generator.generate_weekly_reflection(
-                week_start=week_start,
-                week_end=week_end,
-                method='scheduled'
-            )
 
-            if reflection:
-                results['reflections_created'] += 1
+@shared_task(name='analytics.summarize_weekly_reflections')
+def summarize_weekly_reflections(results, week_start_str: str):
+    """
+    Chord callback for generate_weekly_reflections
 
-                # TODO: Send push notification
-                # send_push_notification(user, reflection)
+    Args:
+        results: generate_reflection_for_user results, one per user
+        week_start_str: Week start date in YYYY-MM-DD format
 
-            else:
-                results['reflections_skipped'] += 1
+    Returns:
+        dict: Summary of reflections generated
+    """
+    summary = {
+        'week_start': week_start_str,
+        'total_users': len(results),
+        'reflections_created': 0,
+        'reflections_skipped': 0,
+        'errors': []
+    }
 
-        except Exception as e:
-            results['errors'].append({
-                'user_id': user.id,
-                'error': str(e)
+    for result in results:
+        if result['success']:
+            summary['reflections_created'] += 1
+        elif result.get('skipped'):
+            summary['reflections_skipped'] += 1
+        else:
+            summary['errors'].append({
+                'user_id': result.get('user_id'),
+                'error': result['error']
             })
 
-    return results
+    return summary
 
 
 @shared_task(name='analytics.update_behavior_patterns')
@@ -72,47 +92,99 @@ def update_behavior_patterns():
     Update behavior patterns for all users
     Runs daily at midnight
 
+    Each user is analyzed in their own update_behavior_patterns_for_user
+    task (chat topics wait on an LLM call), and
+    summarize_behavior_pattern_updates collects the outcome.
+
     Returns:
-        dict: Summary of patterns updated
+        dict: Summary of updates queued
     """
     today = timezone.now().date()
 
     # Analyze last 7 days
-    week_start = today - timedelta(days=7)
-    week_end = today
+    week_start_str = (today - timedelta(days=7)).isoformat()
+    week_end_str = today.isoformat()
 
-    active_users = User.objects.filter(is_active=True)
+    user_ids = User.objects.filter(is_active=True).values_list('id', flat=True)
 
-    results = {
-        'total_users': active_users.count(),
-        'patterns_created': 0,
-        'errors': []
+    job = group(
+        update_behavior_patterns_for_user.s(user_id, week_start_str, week_end_str)
+        for user_id in user_ids.iterator(chunk_size=FANOUT_CHUNK_SIZE)
+    )
+    if job.tasks:
+        chord(job)(summarize_behavior_pattern_updates.s())
+
+    return {
+        'users_queued': len(job.tasks)
     }
 
-    for user in active_users:
-        try:
-            analyzer = BehaviorAnalyzer(user)
-            patterns = analyzer.analyze_all_patterns(week_start, week_end)
 
-            results['patterns_created'] += len(patterns)
+@shared_task(name='analytics.update_behavior_patterns_for_user', rate_limit='30/m', acks_late=True)
+def update_behavior_patterns_for_user(user_id: int, week_start_str: str, week_end_str: str):
+    """
+    Update behavior patterns for one user
 
-        except Exception as e:
-            results['errors'].append({
-                'user_id': user.id,
-                'error': str(e)
-            })
+    Args:
+        user_id: User ID
+        week_start_str: Window start in YYYY-MM-DD format
+        week_end_str: Window end in YYYY-MM-DD format
 
-    return results
+    Returns:
+        dict: Number of patterns detected or error
+    """
+    try:
+        user = User.objects.get(id=user_id)
 
+        analyzer = BehaviorAnalyzer(user)
+        patterns = analyzer.analyze_all_patterns(
+            datetime.strptime(week_start_str, '%Y-%m-%d').date(),
+            datetime.strptime(week_end_str, '%Y-%m-%d').date()
+        )
+
+        return {
+            'user_id': user_id,
+            'patterns_created': len(patterns)
+        }
+
+    except Exception as e:
+        return {
+            'user_id': user_id,
+            'error': str(e)
+        }
 
-@shared_task(name='analytics.generate_reflection_for_user')
-def generate_reflection_for_user(user_id: int, week_start_str: str = None):
+
+@shared_task(name='analytics.summarize_behavior_pattern_updates')
+def summarize_behavior_pattern_updates(results):
     """
-    Generate reflection for a specific user (on-demand)
+    Chord callback for update_behavior_patterns
+
+    Returns:
+        dict: Summary of patterns updated
+    """
+    summary = {
+        'total_users': len(results),
+        'patterns_created': 0,
+        'errors': []
+    }
+
+    for result in results:
+        if 'error' in result:
+            summary['errors'].append(result)
+        else:
+            summary['patterns_created'] += result['patterns_created']
+
+    return summary
+
+
+@shared_task(name='analytics.generate_reflection_for_user', rate_limit='30/m', acks_late=True)
+def generate_reflection_for_user(user_id: int, week_start_str: str = None, method: str = 'on_demand'):
+    """
+    Generate reflection for a specific user (on-demand or from the weekly run)
 
     Args:
         user_id: User ID
         week_start_str: Week start date in YYYY-MM-DD format (optional)
+        method: 'on_demand' or 'scheduled'
 
     Returns:
         dict: Reflection data or error
@@ -132,10 +204,13 @@ def generate_reflection_for_user(user_id: int, week_start_str: str = None):
         reflection = generator.generate_weekly_reflection(
             week_start=week_start,
             week_end=week_end,
-            method='on_demand'
+            method=method
         )
 
         if reflection:
+            # TODO: Send push notification for scheduled reflections
+            # send_push_notification(user, reflection)
+
             return {
                 'success': True,
                 'reflection_id': reflection.id,
@@ -145,17 +220,20 @@ def generate_reflection_for_user(user_id: int, week_start_str: str = None):
         else:
             return {
                 'success': False,
+                'skipped': True,
                 'error': 'Not enough data to generate reflection'
             }
 
     except User.DoesNotExist:
         return {
             'success': False,
+            'user_id': user_id,
             'error': f'User {user_id} not found'
         }
     except Exception as e:
         return {
             'success': False,
+            'user_id': user_id,
             'error': str(e)
         }
 
@@ -186,62 +264,109 @@ def cleanup_old_patterns():
 # Daily Pulse / Morning Brief Tasks
 # ==============================================
 
+# Users per generate_daily_pulse_batch task in the morning run
+DAILY_PULSE_BATCH_SIZE = 500
+
+
 @shared_task(name='analytics.generate_daily_pulse_morning')
 def generate_daily_pulse_morning():
     """
     Generate Daily Pulse for all active users
     Runs every morning at 7:00 AM
 
+    Users are split into batches of DAILY_PULSE_BATCH_SIZE, each generated by
+    its own generate_daily_pulse_batch task so batches run in parallel;
+    summarize_daily_pulse_batches collects the outcome.
+
     Returns:
-        dict: Summary of briefs generated
+        dict: Summary of batches queued
     """
-    from .daily_pulse_service import DailyPulseGenerator
-    from .models import DailyBrief
+    # Get all active users
+    user_ids = User.objects.filter(is_active=True).order_by('id').values_list('id', flat=True)
+
+    batches = []
+    batch = []
+    for user_id in user_ids.iterator(chunk_size=DAILY_PULSE_BATCH_SIZE):
+        batch.append(user_id)
+        if len(batch) == DAILY_PULSE_BATCH_SIZE:
+            batches.append(batch)
+            batch = []
+    if batch:
+        batches.append(batch)
+
+    if batches:
+        chord(group(generate_daily_pulse_batch.s(batch_ids) for batch_ids in batches))(
+            summarize_daily_pulse_batches.s()
+        )
 
-    today = timezone.now().date()
+    return {
+        'total_users': sum(len(batch_ids) for batch_ids in batches),
+        'batches_queued': len(batches)
+    }
 
-    # Get all active users
-    active_users = User.objects.filter(is_active=True)
+
+@shared_task(name='analytics.generate_daily_pulse_batch', acks_late=True)
+def generate_daily_pulse_batch(user_ids):
+    """
+    Generate scheduled briefs for one batch of users
+
+    Briefs are generated with a fixed number of queries per batch; users
+    who already have today's brief are skipped by bulk_generate()
+
+    Args:
+        user_ids: IDs of the users in the batch
+
+    Returns:
+        dict: Briefs created/skipped and errors for the batch
+    """
+    from .daily_pulse_service import DailyPulseGenerator
+
+    users = list(User.objects.filter(id__in=user_ids).order_by('id'))
 
     results = {
-        'total_users': active_users.count(),
+        'total_users': len(users),
         'briefs_created': 0,
         'briefs_skipped': 0,
         'errors': []
     }
 
-    for user in active_users:
-        try:
-            # Check if brief already exists
-            existing = DailyBrief.objects.filter(
-                user=user,
-                date=today
-            ).first()
+    try:
+        briefs, errors = DailyPulseGenerator.bulk_generate(users, trigger='scheduled')
+    except Exception as e:
+        results['errors'].extend({'user_id': user.id, 'error': str(e)} for user in users)
+        return results
 
-            if existing:
-                results['briefs_skipped'] += 1
-                continue
+    # TODO: Send push notification for each brief
+    # send_push_notification(user, brief)
 
-            # Generate brief
-            generator = DailyPulseGenerator(user)
-            brief = generator.generate_daily_brief(trigger='scheduled')
+    results['briefs_created'] = len(briefs)
+    results['briefs_skipped'] = len(users) - len(briefs) - len(errors)
+    results['errors'] = errors
+    return results
 
-            if brief:
-                results['briefs_created'] += 1
 
-                # TODO: Send push notification
-                # send_push_notification(user, brief)
+@shared_task(name='analytics.summarize_daily_pulse_batches')
+def summarize_daily_pulse_batches(results):
+    """
+    Chord callback for generate_daily_pulse_morning
 
-            else:
-                results['briefs_skipped'] += 1
+    Returns:
+        dict: Summary of briefs generated
+    """
+    summary = {
+        'total_users': 0,
+        'briefs_created': 0,
+        'briefs_skipped': 0,
+        'errors': []
+    }
 
-        except Exception as e:
-            results['errors'].append({
-                'user_id': user.id,
-                'error': str(e)
-            })
+    for result in results:
+        summary['total_users'] += result['total_users']
+        summary['briefs_created'] += result['briefs_created']
+        summary['briefs_skipped'] += result['briefs_skipped']
+        summary['errors'].extend(result['errors'])
 
-    return results
+    return summary
 
 
 @shared_task(name='analytics.regenerate_daily_pulse_on_login')
@@ -417,6 +417,7 @@ class GenerateReflectionView(APIView):
         return Response({
             'status': 'generating',
             'task_id': task.id,
+            'status_url': f'/api/ai/task-status/{task.id}/',
             'message': 'Reflection generation started. Check back in a few seconds.'
         }, status=status.HTTP_202_ACCEPTED)
 
@@ -600,27 +601,33 @@ class SendDailyPulseToChatView(APIView):
 
     def post(self, request):
         from .models import DailyBrief
-        from .daily_pulse_service import DailyPulseGenerator
+        from celery import chain
+        from .tasks import regenerate_daily_pulse_on_login, send_daily_pulse_to_chat
         from chat.models import ChatMessage, ChatConversation
 
         today = timezone.now().date()
 
-        # Get or generate today's brief
+        # Get today's brief
         brief = DailyBrief.objects.filter(
             user=request.user,
             date=today
         ).first()
 
         if not brief:
-            # Generate new brief
-            generator = DailyPulseGenerator(request.user)
-            brief = generator.generate_daily_brief(trigger='on_login')
-
-            if not brief:
-                return Response({
-                    'success': False,
-                    'error': 'Failed to generate Daily Pulse'
-                }, status=status.HTTP_400_BAD_REQUEST)
+            # Generate in the background instead of inside the request, then
+            # post it to chat from the same chain
+            task = chain(
+                regenerate_daily_pulse_on_login.si(request.user.id),
+                send_daily_pulse_to_chat.si(request.user.id)
+            ).delay()
+
+            return Response({
+                'success': True,
+                'status': 'generating',
+                'task_id': task.id,
+                'status_url': f'/api/ai/task-status/{task.id}/',
+                'message': 'Daily Pulse is being generated and will be sent to chat'
+            }, status=status.HTTP_202_ACCEPTED)
 
         # Check if already sent to chat
         if brief.shown_in_chat:
@@ -114,6 +114,9 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASSWORD", ""),
         "HOST": os.getenv("DB_HOST", ""),
         "PORT": os.getenv("DB_PORT", ""),
+        # Reuse connections across requests instead of reconnecting each time
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
@@ -229,6 +232,20 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "UTC"
 
+# Analytics tasks get their own queues so slow LLM work (reflections, chat
+# topic analysis) does not hold up the morning pulse or cheap cleanup.
+# Unlisted tasks, including the fan-out dispatchers and chord callbacks,
+# stay on the default "celery" queue. Workers must consume these queues
+# (see Procfile).
+CELERY_TASK_ROUTES = {
+    "analytics.generate_reflection_for_user": {"queue": "llm"},
+    "analytics.update_behavior_patterns_for_user": {"queue": "llm"},
+    "analytics.generate_daily_pulse_batch": {"queue": "pulse"},
+    "analytics.regenerate_daily_pulse_on_login": {"queue": "pulse"},
+    "analytics.send_daily_pulse_to_chat": {"queue": "pulse"},
+    "analytics.cleanup_old_patterns": {"queue": "db_cleanup"},
+}
+
 # Celery Beat schedule for periodic tasks
 CELERY_BEAT_SCHEDULE = {
     # Check for task reminders every 10 minutes
@@ -2,6 +2,8 @@
 AI Insights API Views
 Endpoints for category progress, skip patterns, and smart task suggestions
 """
+import logging
+
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -14,6 +16,8 @@ from .models import Todo
 from .advanced_models import AIInsight, TaskCompletion
 from ai.task_intelligence import calculate_category_progress, analyze_skip_patterns
 
+logger = logging.getLogger(__name__)
+
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -236,9 +240,7 @@ def complete_task_with_feedback(request, task_id):
             status=status.HTTP_404_NOT_FOUND
         )
     except Exception as e:
-        print(f"Task completion error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Task completion error")
         return Response(
             {'error': str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -353,9 +355,7 @@ def suggest_smart_task(request):
         })
 
     except Exception as e:
-        print(f"Smart suggestion error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Smart suggestion error")
         return Response(
             {'error': str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
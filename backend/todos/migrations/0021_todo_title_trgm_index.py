@@ -0,0 +1,37 @@
+from django.db import migrations
+
+
+def create_title_trgm_index(apps, schema_editor):
+    """
+    Add a trigram GIN index for case-insensitive title search.
+
+    Django compiles title__icontains to UPPER("title"::text) LIKE UPPER(...)
+    on PostgreSQL, so the index is built over the same expression.
+    pg_trgm is PostgreSQL-only; other backends (SQLite in dev) are skipped.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS todos_todo_title_upper_trgm_idx '
+        'ON todos_todo USING gin (UPPER(title::text) gin_trgm_ops)'
+    )
+
+
+def drop_title_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('DROP INDEX IF EXISTS todos_todo_title_upper_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0020_todo_country_todo_depends_on_todo_evidence_fields_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_title_trgm_index, drop_title_trgm_index),
+    ]
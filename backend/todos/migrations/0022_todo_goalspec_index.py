@@ -0,0 +1,17 @@
+# Generated by Django 5.1.5 on 2026-10-17 06:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0021_todo_title_trgm_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['user', 'goalspec', 'scheduled_date'], name='todos_todo_user_id_02c0e6_idx'),
+        ),
+    ]
@@ -433,6 +433,7 @@ class Todo(models.Model):
         ordering = ["scheduled_date", "priority", "created_at"]
         indexes = [
             models.Index(fields=["user", "scheduled_date", "status"]),
+            models.Index(fields=["user", "goalspec", "scheduled_date"]),
             models.Index(fields=["user", "university"]),
             models.Index(fields=["user", "is_blocker"]),
             models.Index(fields=["user", "is_auto_generated"]),
@@ -508,11 +509,22 @@ class Todo(models.Model):
         self.progress_percentage = self.calculate_progress()
         self.save(update_fields=["progress_percentage"])
 
-    def is_blocked(self):
-        """Check if task is blocked by dependencies"""
+    def is_blocked(self, open_blocker_keys=None):
+        """
+        Check if task is blocked by dependencies
+
+        Pass open_blocker_keys from Todo.open_blocker_keys() when checking many
+        tasks to answer from that set instead of querying per task.
+        """
         if not self.blocked_by:
             return False
 
+        if open_blocker_keys is not None:
+            return any(
+                (self.user_id, int(blocker_id)) in open_blocker_keys
+                for blocker_id in self.blocked_by
+            )
+
         # Check if any blocker tasks are not done
         blocker_tasks = Todo.objects.filter(
             id__in=self.blocked_by, user=self.user
@@ -520,15 +532,33 @@ class Todo(models.Model):
 
         return blocker_tasks.exists()
 
+    @staticmethod
+    def open_blocker_keys(tasks):
+        """(user_id, id) of every not-done blocker of the given tasks, in one query"""
+        blocker_ids = {
+            int(blocker_id) for task in tasks for blocker_id in (task.blocked_by or [])
+        }
+        if not blocker_ids:
+            return set()
+
+        return set(
+            Todo.objects.filter(
+                id__in=blocker_ids, user_id__in={task.user_id for task in tasks}
+            )
+            .exclude(status="done")
+            .values_list("user_id", "id")
+        )
+
     def unlock_dependents(self):
         """When this task completes, unlock dependent tasks"""
         if not self.unlocks:
             return
 
-        dependent_tasks = Todo.objects.filter(id__in=self.unlocks, user=self.user)
+        dependent_tasks = list(Todo.objects.filter(id__in=self.unlocks, user=self.user))
+        open_blocker_keys = Todo.open_blocker_keys(dependent_tasks)
 
         for task in dependent_tasks:
-            if not task.is_blocked():
+            if not task.is_blocked(open_blocker_keys):
                 task.status = "ready"
                 task.save(update_fields=["status"])
 
@@ -1,3 +1,4 @@
+from django.db import models
 from django.utils import timezone
 from rest_framework import serializers
 
@@ -192,6 +193,15 @@ class TodoListSerializer(serializers.ModelSerializer):
         )
 
 
+class BlockedStatusListSerializer(serializers.ListSerializer):
+    """List serializer that resolves is_blocked_status for all items in one query"""
+
+    def to_representation(self, data):
+        tasks = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        self.child.open_blocker_keys = Todo.open_blocker_keys(tasks)
+        return super().to_representation(tasks)
+
+
 class AtomicTaskSerializer(serializers.ModelSerializer):
     """
     Full serializer for atomic tasks with all fields
@@ -205,6 +215,7 @@ class AtomicTaskSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Todo
+        list_serializer_class = BlockedStatusListSerializer
         fields = (
             # Basic info
             "id",
@@ -261,4 +272,4 @@ class AtomicTaskSerializer(serializers.ModelSerializer):
 
     def get_is_blocked_status(self, obj):
         """Check if task is currently blocked"""
-        return obj.is_blocked()
+        return obj.is_blocked(getattr(self, "open_blocker_keys", None))
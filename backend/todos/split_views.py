@@ -4,6 +4,8 @@ Task Splitting API Views
 Endpoints for intelligently breaking down tasks.
 """
 
+import logging
+
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -13,6 +15,8 @@ from django.shortcuts import get_object_or_404
 from .models import Todo
 from ai.task_splitter import task_splitter
 
+logger = logging.getLogger(__name__)
+
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -78,9 +82,7 @@ def split_task(request, task_id):
         return Response(result)
 
     except Exception as e:
-        print(f"Error splitting task: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error splitting task")
         return Response(
             {'error': f'Failed to split task: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.5 on 2026-10-17 07:02
+
+from django.db import migrations, models
+
+
+def flag_profiles_with_patterns(apps, schema_editor):
+    """Set has_behavior_patterns for users that already have stored patterns."""
+    UserProfile = apps.get_model('users', 'UserProfile')
+    UserBehaviorPattern = apps.get_model('analytics', 'UserBehaviorPattern')
+
+    UserProfile.objects.filter(
+        user_id__in=UserBehaviorPattern.objects.values('user_id')
+    ).update(has_behavior_patterns=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0020_remove_intervention_fields'),
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='has_behavior_patterns',
+            field=models.BooleanField(default=False, help_text='Set once behavior analysis stores a pattern; the daily pulse skips the pattern lookup while False'),
+        ),
+        migrations.RunPython(flag_profiles_with_patterns, migrations.RunPython.noop),
+    ]
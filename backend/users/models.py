@@ -98,6 +98,10 @@ class UserProfile(models.Model):
         default=480,
         help_text="User's available working minutes per day (default: 480 = 8 hours)"
     )
+    has_behavior_patterns = models.BooleanField(
+        default=False,
+        help_text="Set once behavior analysis stores a pattern; the daily pulse skips the pattern lookup while False"
+    )
 
     # Additional Context (JSON fields for flexibility)
     languages = models.JSONField(default=list, blank=True)  # [{"code": "en", "level": "B2"}]
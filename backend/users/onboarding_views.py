@@ -4,6 +4,8 @@ Onboarding API Views
 New multi-category onboarding flow with web research and detailed task generation
 """
 
+import logging
+
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -13,10 +15,12 @@ from django.shortcuts import get_object_or_404
 from .models import User, GoalSpec, UserProfile, OnboardingProgress, OnboardingChatData
 from .goalspec_serializers import GoalSpecSerializer
 from .serializers import OnboardingProgressSerializer, OnboardingChatDataSerializer
+from .tasks import research_university_task
 from ai.path_research_agent import PathResearchAgent
-from ai.university_research_agent import UniversityResearchAgent
 from ai.feasibility_validator import feasibility_validator
 
+logger = logging.getLogger(__name__)
+
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -255,10 +259,8 @@ def generate_tasks(request):
                     )
                     created_tasks.append(todo_task)
                     print(f"[Onboarding] Created task: {task_data['title'][:60]}...")
-                except Exception as e:
-                    print(f"[Onboarding] Error creating task {task_data.get('title', 'unknown')}: {e}")
-                    import traceback
-                    traceback.print_exc()
+                except Exception:
+                    logger.exception("[Onboarding] Error creating task %s", task_data.get('title', 'unknown'))
 
         print(f"[Onboarding] Total tasks created: {len(created_tasks)}")
 
@@ -274,9 +276,7 @@ def generate_tasks(request):
         })
 
     except Exception as e:
-        print(f"Task generation error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Task generation error")
         return Response(
             {'error': f'Failed to generate tasks: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -318,7 +318,18 @@ def research_specific_university(request):
         "intake": "Sep 2026"
     }
 
-    Response:
+    Research runs in a Celery task because the advanced Tavily search plus
+    LLM extraction takes several seconds. Poll status_url until the task
+    completes; its result holds the university data.
+
+    Response (202):
+    {
+        "task_id": "...",
+        "status": "pending",
+        "status_url": "/api/ai/task-status/<task_id>/"
+    }
+
+    Completed task result:
     {
         "id": "custom_1",
         "title": "Stanford University",
@@ -341,26 +352,14 @@ def research_specific_university(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    try:
-        # Use UniversityResearchAgent for deep research
-        agent = UniversityResearchAgent()
-        university_data = agent.research_university_program(
-            university_name=university_name,
-            program=program,
-            intake=intake
-        )
-
-        return Response(university_data)
-
-    except Exception as e:
-        print(f"University research error: {e}")
-        import traceback
-        traceback.print_exc()
-        return Response(
-            {'error': f'Failed to research university: {str(e)}'},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    task = research_university_task.delay(request.user.id, university_name, program, intake)
 
+    return Response({
+        'message': 'University research started',
+        'task_id': task.id,
+        'status': 'pending',
+        'status_url': f'/api/ai/task-status/{task.id}/'
+    }, status=status.HTTP_202_ACCEPTED)
 
 
 @api_view(['POST'])
@@ -410,9 +409,7 @@ def validate_goal_feasibility(request):
         return Response(result)
 
     except Exception as e:
-        print(f"Feasibility validation error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Feasibility validation error")
         return Response(
             {'error': f'Failed to validate goal: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -468,9 +465,7 @@ def onboarding_chat_init(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     except Exception as e:
-        print(f"Chat init error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Chat init error")
         return Response(
             {'error': f'Failed to initialize chat: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -529,9 +524,7 @@ def onboarding_chat_send(request):
         return Response(result)
 
     except Exception as e:
-        print(f"Chat send error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Chat send error")
         return Response(
             {'error': f'Failed to process message: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -580,9 +573,7 @@ def onboarding_status(request):
         })
 
     except Exception as e:
-        print(f"Status check error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Status check error")
         return Response(
             {'error': f'Failed to check status: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -648,9 +639,7 @@ def onboarding_chat_complete(request):
         })
 
     except Exception as e:
-        print(f"Chat complete error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Chat complete error")
         return Response(
             {'error': f'Failed to save category data: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -742,9 +731,7 @@ def onboarding_finalize(request):
         })
 
     except Exception as e:
-        print(f"Finalize error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Finalize error")
         return Response(
             {'error': f'Failed to finalize onboarding: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -1103,10 +1090,8 @@ def generate_tasks_for_goalspecs(user, goalspecs):
                 print(f"[TASK_GEN] ⚠️ WARNING: 0 tasks generated for {goalspec.title}!")
                 print(f"[TASK_GEN] This usually means milestone generation failed or LLM returned empty response")
 
-        except Exception as e:
-            print(f"[TASK_GEN] ❌ ERROR generating tasks for {goalspec.title}: {str(e)}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("[TASK_GEN] ❌ ERROR generating tasks for %s", goalspec.title)
             tasks = []
 
         print(f"[OnboardingChat] Generated {len(tasks)} tasks for goal: {goalspec.title}")
@@ -1191,10 +1176,8 @@ def generate_tasks_for_goalspecs(user, goalspecs):
                 )
                 total_tasks += 1
 
-            except Exception as e:
-                print(f"[OnboardingChat] Error creating task {task_data.get('title', 'unknown')}: {e}")
-                import traceback
-                traceback.print_exc()
+            except Exception:
+                logger.exception("[OnboardingChat] Error creating task %s", task_data.get('title', 'unknown'))
 
     print(f"[OnboardingChat] Total tasks created: {total_tasks}")
     return total_tasks
@@ -0,0 +1,42 @@
+"""
+Celery tasks for long-running onboarding research
+"""
+import logging
+
+from celery import shared_task
+
+from ai.university_research_agent import UniversityResearchAgent
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, name='users.research_university')
+def research_university_task(self, user_id, university_name, program, intake):
+    """
+    Run deep university research (Tavily advanced search + LLM extraction)
+    in background
+
+    Args:
+        user_id: User ID that requested the research
+        university_name: University to research
+        program: Program name
+        intake: Intake term
+
+    Returns:
+        University data dict (same shape as the old synchronous response),
+        or dict with status 'error'
+    """
+    try:
+        self.update_state(state='PROGRESS', meta={'stage': 'Researching university'})
+
+        agent = UniversityResearchAgent()
+        return agent.research_university_program(
+            university_name=university_name,
+            program=program,
+            intake=intake
+        )
+
+    except Exception as e:
+        error_msg = f'Failed to research university: {str(e)}'
+        logger.exception("research_university_task failed for user %s", user_id)
+        return {'status': 'error', 'error': error_msg}